@@ -17,8 +17,8 @@ History:
 '''
 
 import os
-import inspect
-import datetime
+import sys
+import time
 
 from espa_constants import *
 
@@ -36,6 +36,12 @@ messages.
 __DEBUG_ON__ = False
 
 
+'''
+The timestamp format used for all log messages.
+'''
+__TIME_FORMAT__ = '%Y-%m-%d %H:%M.%S'
+
+
 def open_log_handler(file_name):
     '''
     Description:
@@ -91,18 +97,11 @@ def build_log_message(message, filename, line):
     Returns:
         Returns an ESPA standard log message
     '''
-    now = datetime.datetime.now()
-    pid = os.getpid()
-    return "%s-%s-%s %s:%s.%s %d [%s]:%d %s" % (now.year,
-                                                str(now.month).zfill(2),
-                                                str(now.day).zfill(2),
-                                                str(now.hour).zfill(2),
-                                                str(now.minute).zfill(2),
-                                                str(now.second).zfill(2),
-                                                pid,
-                                                filename,
-                                                line,
-                                                message)
+    return "%s %d [%s]:%d %s" % (time.strftime(__TIME_FORMAT__),
+                                 os.getpid(),
+                                 filename,
+                                 line,
+                                 message)
 # END build_log_message
 
 
@@ -116,12 +115,10 @@ def log(message, file=None, line=None):
       line(optional) - to override the location of the message
       file(optional) - to specify an alternative module name instead
     '''
-    global __LOG_HANDLER__
-
     # Get information about the calling code for the filename and line_number
-    (frame, filename, line_number, function_name, lines, index) = \
-        inspect.getouterframes(inspect.currentframe())[1]
-    filename = os.path.basename(filename)
+    frame = sys._getframe(1)
+    filename = os.path.basename(frame.f_code.co_filename)
+    line_number = frame.f_lineno
 
     # Use the one provided
     if line is not None:
@@ -136,7 +133,7 @@ def log(message, file=None, line=None):
 
     # Determine where to output the message
     if __LOG_HANDLER__ is None:
-        print (message_string)
+        print(message_string)
     else:
         __LOG_HANDLER__.write(message_string + '\n')
 # END log
@@ -158,14 +155,12 @@ def debug(message, file=None, line=None):
     Description:
       Write the message to the log it debug is turned on
     '''
-    global __DEBUG_ON__
-
     if __DEBUG_ON__:
         # Get information about the calling code for the filename and
         # line_number
-        (frame, filename, line_number, function_name, lines, index) = \
-            inspect.getouterframes(inspect.currentframe())[1]
-        filename = os.path.basename(filename)
+        frame = sys._getframe(1)
+        filename = os.path.basename(frame.f_code.co_filename)
+        line_number = frame.f_lineno
 
         # Use the one provided
         if line is not None:
@@ -46,14 +46,15 @@ int convert_espa_to_gtif
 {
     char FUNC_NAME[] = "convert_espa_to_gtif";  /* function name */
     char errmsg[STR_SIZE];      /* error message */
-    char gdal_cmd[STR_SIZE];    /* command string for GDAL call */
+    char nodata[STR_SIZE];      /* fill value string for the nodata tag */
+    char *gdal_args[14];        /* command and arguments for the GDAL call */
     char gtif_band[STR_SIZE];   /* name of the GeoTIFF file for this band */
     char hdr_file[STR_SIZE];    /* name of the header file for this band */
     char xml_file[STR_SIZE];    /* new XML file for the GeoTIFF product */
-    char tmpfile[STR_SIZE];     /* filename of file.tif.aux.xml */
     char *cptr = NULL;          /* pointer to empty space in the band name */
     int i;                      /* looping variable for each band */
     int count;                  /* number of chars copied in snprintf */
+    int nargs;                  /* number of arguments in gdal_args */
     int status = SUCCESS;       /* status for multi-threaded area */
     Espa_internal_meta_t xml_metadata;  /* XML metadata structure to be
                                    populated by reading the XML metadata file */
@@ -80,7 +81,7 @@ int convert_espa_to_gtif
        band name of each band in the XML file.  Blank spaced in the band name
        will be replaced with underscores. */
 #ifdef _OPENMP
-    #pragma omp parallel for private (i, count, gtif_band, cptr, gdal_cmd, errmsg, tmpfile, hdr_file)
+    #pragma omp parallel for private (i, count, gtif_band, cptr, nodata, gdal_args, nargs, errmsg, hdr_file)
 #endif
     for (i = 0; i < xml_metadata.nbands; i++)
     {
@@ -103,47 +104,47 @@ int convert_espa_to_gtif
         printf ("Converting %s to %s\n", xml_metadata.band[i].file_name,
             gtif_band);
 
-        /* Check if the fill value is defined */
-        if ((int) xml_metadata.band[i].fill_value == (int) ESPA_INT_META_FILL)
-        {
-            /* Fill value is not defined so don't write the nodata tag */
-            count = snprintf (gdal_cmd, sizeof (gdal_cmd),
-                "gdal_translate -of Gtiff -co \"TFW=YES\" -q %s %s",
-                xml_metadata.band[i].file_name, gtif_band);
-        }
-        else
+        /* Set up the GDAL call.  GDAL_PAM_ENABLED is turned off so the
+           {gtif_name}.tif.aux.xml file, which isn't needed, is never
+           written in the first place. */
+        nargs = 0;
+        gdal_args[nargs++] = "gdal_translate";
+        gdal_args[nargs++] = "--config";
+        gdal_args[nargs++] = "GDAL_PAM_ENABLED";
+        gdal_args[nargs++] = "NO";
+        gdal_args[nargs++] = "-of";
+        gdal_args[nargs++] = "Gtiff";
+        gdal_args[nargs++] = "-co";
+        gdal_args[nargs++] = "TFW=YES";
+        gdal_args[nargs++] = "-q";
+
+        /* Check if the fill value is defined.  If not, then don't write the
+           nodata tag. */
+        if ((int) xml_metadata.band[i].fill_value != (int) ESPA_INT_META_FILL)
         {
             /* Fill value is defined so use the nodata tag */
-            count = snprintf (gdal_cmd, sizeof (gdal_cmd),
-             "gdal_translate -of Gtiff -a_nodata %ld -co \"TFW=YES\" -q %s %s",
-                xml_metadata.band[i].fill_value, xml_metadata.band[i].file_name,
-                gtif_band);
-        }
-        if (count < 0 || count >= sizeof (gdal_cmd))
-        {
-            sprintf (errmsg, "Overflow of gdal_cmd string");
-            error_handler (true, FUNC_NAME, errmsg);
-            status = ERROR;
-        }
-
-        if (system (gdal_cmd) == -1)
-        {
-            sprintf (errmsg, "Running gdal_translate: %s", gdal_cmd);
-            error_handler (true, FUNC_NAME, errmsg);
-            status = ERROR;
+            count = snprintf (nodata, sizeof (nodata), "%ld",
+                xml_metadata.band[i].fill_value);
+            if (count < 0 || count >= sizeof (nodata))
+            {
+                sprintf (errmsg, "Overflow of nodata string");
+                error_handler (true, FUNC_NAME, errmsg);
+                status = ERROR;
+            }
+            gdal_args[nargs++] = "-a_nodata";
+            gdal_args[nargs++] = nodata;
         }
+        gdal_args[nargs++] = xml_metadata.band[i].file_name;
+        gdal_args[nargs++] = gtif_band;
+        gdal_args[nargs] = NULL;
 
-        /* Remove the {gtif_name}.tif.aux.xml file since it's not needed and
-           clutters the results.  Don't worry about testing the unlink
-           results.  If it doesn't unlink it's not fatal. */
-        count = snprintf (tmpfile, sizeof (tmpfile), "%s.aux.xml", gtif_band);
-        if (count < 0 || count >= sizeof (tmpfile))
+        if (run_cmd (gdal_args) != SUCCESS)
         {
-            sprintf (errmsg, "Overflow of tmpfile string");
+            sprintf (errmsg, "Running gdal_translate on %s",
+                xml_metadata.band[i].file_name);
             error_handler (true, FUNC_NAME, errmsg);
             status = ERROR;
         }
-        unlink (tmpfile);
 
         /* Remove the source file if specified */
         if (del_src && status != ERROR)
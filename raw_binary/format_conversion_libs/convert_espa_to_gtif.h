@@ -22,6 +22,7 @@ NOTES:
 #include "espa_metadata.h"
 #include "parse_metadata.h"
 #include "write_metadata.h"
+#include "run_cmd.h"
 
 /* Defines */
 
@@ -346,6 +346,7 @@ int write_sds_attributes
     char errmsg[STR_SIZE];      /* error message */
     char tmp_msg[STR_SIZE];     /* temporary message */
     char message[5000];         /* description of QA bits or classes */
+    size_t msg_len;             /* length of the description in message */
     int i;                      /* looping variable for each SDS */
     int count;                  /* number of chars copied in snprintf */
     double dval[MAX_TOTAL_BANDS];/* attribute values to be written */
@@ -466,6 +467,7 @@ int write_sds_attributes
             error_handler (true, FUNC_NAME, errmsg);
             return (ERROR);
         }
+        msg_len = count;
 
         for (i = 0; i < bmeta->nbits; i++)
         {
@@ -478,17 +480,20 @@ int write_sds_attributes
                 return (ERROR);
             }
 
-            if (strlen (message) + strlen (tmp_msg) >= sizeof (message))
+            /* Append at the tracked end of the message, rather than
+               rescanning the message for its length every time */
+            if (msg_len + count >= sizeof (message))
             {
                 sprintf (errmsg, "Overflow of message string");
                 error_handler (true, FUNC_NAME, errmsg);
                 return (ERROR);
             }
-            strcat (message, tmp_msg);
+            strcpy (&message[msg_len], tmp_msg);
+            msg_len += count;
         }
 
         attr.type = DFNT_CHAR8;
-        attr.nval = strlen (message);
+        attr.nval = msg_len;
         attr.name = "Bitmap description";
         if (put_attr_string (sds_id, &attr, message) != SUCCESS)
         {
@@ -509,6 +514,7 @@ int write_sds_attributes
             error_handler (true, FUNC_NAME, errmsg);
             return (ERROR);
         }
+        msg_len = count;
 
         for (i = 0; i < bmeta->nclass; i++)
         {
@@ -522,17 +528,20 @@ int write_sds_attributes
                 return (ERROR);
             }
 
-            if (strlen (message) + strlen (tmp_msg) >= sizeof (message))
+            /* Append at the tracked end of the message, rather than
+               rescanning the message for its length every time */
+            if (msg_len + count >= sizeof (message))
             {
                 sprintf (errmsg, "Overflow of message string");
                 error_handler (true, FUNC_NAME, errmsg);
                 return (ERROR);
             }
-            strcat (message, tmp_msg);
+            strcpy (&message[msg_len], tmp_msg);
+            msg_len += count;
         }
 
         attr.type = DFNT_CHAR8;
-        attr.nval = strlen (message);
+        attr.nval = msg_len;
         attr.name = "Class description";
         if (put_attr_string (sds_id, &attr, message) != SUCCESS)
         {
@@ -600,6 +609,9 @@ int create_hdf_metadata
     int nbytes;                   /* number of bytes in the data type */
     int nlines;                   /* number of lines in the band */
     int nsamps;                   /* number of samples in the band */
+    int line;                     /* looping variable for blocks of lines */
+    int block_lines;              /* number of lines in a full block */
+    int nblock_lines;             /* number of lines in the current block */
     int dim;                      /* looping variable for dimensions */
     int count;                    /* number of chars copied in snprintf */
     int ngrids;                   /* current number of grids in the product;
@@ -692,27 +704,6 @@ int create_hdf_metadata
                 return (ERROR);
         }
 
-        /* Allocate memory for the file buffer */
-        file_buf = calloc (nlines * nsamps, nbytes);
-        if (file_buf == NULL)
-        {
-            sprintf (errmsg, "Error allocating memory for the file buffer.");
-            error_handler (true, FUNC_NAME, errmsg);
-            return (ERROR);
-        }
-
-        /* Read the data from the raw binary file */
-        if (read_raw_binary (fp_rb, nlines, nsamps, nbytes, file_buf) !=
-            SUCCESS)
-        {
-            sprintf (errmsg, "Reading image data from the raw binary file");
-            error_handler (true, FUNC_NAME, errmsg);
-            return (ERROR);
-        }
-
-        /* Close the raw binary file */
-        close_raw_binary (fp_rb);
-
         /* Find the location of the file extension, then modify the filename
            a bit to depict the big endian version of the imagery needed for
            the HDF files.  (It's assumed we are running on Linux, thus the
@@ -820,20 +811,54 @@ int create_hdf_metadata
             return (ERROR);
         }
 
-        /* Write the new big endian data to the SDS.  Start writing at the
-           beginning of the SDS, write every element, and write all the
-           elements in both dimensions. */
-        start[0] = start[1] = 0;
-        edge[0] = dims[0];
-        edge[1] = dims[1];
-        if (SDwritedata (sds_id, start, NULL, edge, file_buf) == HDF_ERROR)
+        /* Allocate memory for a block of lines.  The band is copied to the
+           SDS a block at a time, so the whole band never has to be held in
+           memory. */
+        block_lines = (nlines < HDF_BLOCK_LINES) ? nlines : HDF_BLOCK_LINES;
+        file_buf = calloc (block_lines * nsamps, nbytes);
+        if (file_buf == NULL)
         {
-            sprintf (errmsg, "Writing the external dataset for this SDS (%d): "
-                "%s.", i, bendian_file);
+            sprintf (errmsg, "Error allocating memory for the file buffer.");
             error_handler (true, FUNC_NAME, errmsg);
             return (ERROR);
         }
 
+        /* Write the new big endian data to the SDS.  Write every element,
+           and write all the elements in both dimensions, one block of lines
+           at a time. */
+        start[1] = 0;
+        edge[1] = dims[1];
+        for (line = 0; line < nlines; line += block_lines)
+        {
+            nblock_lines = nlines - line;
+            if (nblock_lines > block_lines)
+                nblock_lines = block_lines;
+
+            /* Read the block of data from the raw binary file */
+            if (read_raw_binary (fp_rb, nblock_lines, nsamps, nbytes,
+                file_buf) != SUCCESS)
+            {
+                sprintf (errmsg, "Reading image data from the raw binary "
+                    "file");
+                error_handler (true, FUNC_NAME, errmsg);
+                return (ERROR);
+            }
+
+            start[0] = line;
+            edge[0] = nblock_lines;
+            if (SDwritedata (sds_id, start, NULL, edge, file_buf) ==
+                HDF_ERROR)
+            {
+                sprintf (errmsg, "Writing the external dataset for this SDS "
+                    "(%d): %s.", i, bendian_file);
+                error_handler (true, FUNC_NAME, errmsg);
+                return (ERROR);
+            }
+        }
+
+        /* Close the raw binary file */
+        close_raw_binary (fp_rb);
+
         /* Write the SDS-level metadata */
         if (write_sds_attributes (sds_id, &xml_metadata->band[i]) != SUCCESS)
         {
@@ -31,6 +31,7 @@ NOTES:
 
 /* Defines */
 #define HDF_ERROR -1
+#define HDF_BLOCK_LINES 512  /* number of lines copied to an SDS at a time */
 
 /* Prototypes */
 int write_global_attributes
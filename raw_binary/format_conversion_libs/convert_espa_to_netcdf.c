@@ -80,6 +80,7 @@ int write_band_attributes
     char errmsg[STR_SIZE];      /* error message */
     char tmp_msg[STR_SIZE];     /* temporary message */
     char message[5000];         /* description of QA bits or classes */
+    size_t msg_len;             /* length of the description in message */
     int i;                      /* looping variable for each SDS */
     int count;                  /* number of chars copied in snprintf */
     signed char byte_dval[MAX_TOTAL_BANDS];/* attribute values to be written */
@@ -254,6 +255,7 @@ int write_band_attributes
             error_handler (true, FUNC_NAME, errmsg);
             return (ERROR);
         }
+        msg_len = count;
 
         for (i = 0; i < bmeta->nbits; i++)
         {
@@ -266,17 +268,20 @@ int write_band_attributes
                 return (ERROR);
             }
 
-            if (strlen (message) + strlen (tmp_msg) >= sizeof (message))
+            /* Append at the tracked end of the message, rather than
+               rescanning the message for its length every time */
+            if (msg_len + count >= sizeof (message))
             {
                 sprintf (errmsg, "Overflow of message string");
                 error_handler (true, FUNC_NAME, errmsg);
                 return (ERROR);
             }
-            strcat (message, tmp_msg);
+            strcpy (&message[msg_len], tmp_msg);
+            msg_len += count;
         }
 
         retval = nc_put_att_text (ncid, band_varid, "Bitmap description", 
-             strlen(message), message);
+             msg_len, message);
         if (retval)
         {
             netCDF_ERR (retval);
@@ -297,6 +302,7 @@ int write_band_attributes
             error_handler (true, FUNC_NAME, errmsg);
             return (ERROR);
         }
+        msg_len = count;
 
         for (i = 0; i < bmeta->nclass; i++)
         {
@@ -310,17 +316,20 @@ int write_band_attributes
                 return (ERROR);
             }
 
-            if (strlen (message) + strlen (tmp_msg) >= sizeof (message))
+            /* Append at the tracked end of the message, rather than
+               rescanning the message for its length every time */
+            if (msg_len + count >= sizeof (message))
             {
                 sprintf (errmsg, "Overflow of message string");
                 error_handler (true, FUNC_NAME, errmsg);
                 return (ERROR);
             }
-            strcat (message, tmp_msg);
+            strcpy (&message[msg_len], tmp_msg);
+            msg_len += count;
         }
 
         retval = nc_put_att_text (ncid, band_varid, "Class description", 
-             strlen(message), message);
+             msg_len, message);
         if (retval)
         {
             netCDF_ERR (retval);
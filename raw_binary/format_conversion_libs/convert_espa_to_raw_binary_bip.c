@@ -60,13 +60,20 @@ int convert_espa_to_raw_binary_bip
     int i;                      /* looping variable for each band */
     int l;                      /* looping variable for each line */
     int s;                      /* looping variable for each sample */
+    int block_lines;            /* number of lines in the current block */
+    int block_pix;              /* number of pixels per band in the current
+                                   block */
+    int band_pix;               /* number of pixels per band in a full block,
+                                   i.e. offset between the bands in the input
+                                   buffer */
     int nbytes;                 /* number of bytes per pixel in the data type */
     int nbytes_line;            /* number of bytes per line in the data type */
     int count;                  /* number of chars copied in snprintf */
     int curr_pix;               /* index for current pixel for QA conversion */
     int curr_ipix;              /* index for current input pixel */
     int curr_opix;              /* index for current output pixel */
-    int number_elements;        /* number of elements per line for all bands */
+    int number_elements;        /* number of elements per block for all
+                                   bands */
     void *file_buf = NULL;      /* pointer to correct input file buffer */
     uint8 *tmp_buf_u8 = NULL;   /* buffer for uint8 QA data to be read */
     uint8 *file_buf_u8 = NULL;  /* buffer for uint8 data to be read */
@@ -189,8 +196,8 @@ int convert_espa_to_raw_binary_bip
         return (ERROR);
     }
 
-    /* Allocate memory for a single line of the image and all the bands, based
-       on the input data type of the first band */
+    /* Allocate memory for a block of lines of the image and all the bands,
+       based on the input data type of the first band */
     switch (bmeta[0].data_type)
     {
         case ESPA_UINT8:
@@ -210,23 +217,24 @@ int convert_espa_to_raw_binary_bip
     }
 
     /* Input data */
-    file_buf = calloc (bmeta[0].nsamps * xml_metadata.nbands, nbytes);
+    band_pix = BIP_BLOCK_LINES * bmeta[0].nsamps;
+    file_buf = calloc (band_pix * xml_metadata.nbands, nbytes);
     if (file_buf == NULL)
     {
-        sprintf (errmsg, "Allocating memory for a line of %d-byte data "
-            "containing %d samples for all %d bands.", nbytes, bmeta[0].nsamps,
-            xml_metadata.nbands);
+        sprintf (errmsg, "Allocating memory for %d lines of %d-byte data "
+            "containing %d samples for all %d bands.", BIP_BLOCK_LINES, nbytes,
+            bmeta[0].nsamps, xml_metadata.nbands);
         error_handler (true, FUNC_NAME, errmsg);
         return (ERROR);
     }
 
     /* Output data */
-    ofile_buf = calloc (bmeta[0].nsamps * xml_metadata.nbands, nbytes);
+    ofile_buf = calloc (band_pix * xml_metadata.nbands, nbytes);
     if (ofile_buf == NULL)
     {
-        sprintf (errmsg, "Allocating memory for a line of %d-byte data "
-            "containing %d samples for all %d bands.", nbytes, bmeta[0].nsamps,
-            xml_metadata.nbands);
+        sprintf (errmsg, "Allocating memory for %d lines of %d-byte data "
+            "containing %d samples for all %d bands.", BIP_BLOCK_LINES, nbytes,
+            bmeta[0].nsamps, xml_metadata.nbands);
         error_handler (true, FUNC_NAME, errmsg);
         return (ERROR);
     }
@@ -258,24 +266,29 @@ int convert_espa_to_raw_binary_bip
        input array */
     if (convert_qa)
     {
-        tmp_buf_u8 = calloc (bmeta[0].nsamps, sizeof (uint8));
+        tmp_buf_u8 = calloc (band_pix, sizeof (uint8));
         if (tmp_buf_u8 == NULL)
         {
-            sprintf (errmsg, "Allocating memory for a line of QA data "
-                "containing %d samples.", bmeta[0].nsamps);
+            sprintf (errmsg, "Allocating memory for %d lines of QA data "
+                "containing %d samples.", BIP_BLOCK_LINES, bmeta[0].nsamps);
             error_handler (true, FUNC_NAME, errmsg);
             return (ERROR);
         }
     }
 
-    /* Loop through the lines in the input raw binary file.  Read each line
-       for each band, put into the output BIP buffer, and write to the output
-       file. */
+    /* Loop through the lines in the input raw binary file a block at a time.
+       Read the block of lines for each band, put into the output BIP buffer,
+       and write to the output file.  Each band's block is contiguous in its
+       file, so this is a single read per band for the whole block rather
+       than one per line. */
     nbytes_line = nbytes * bmeta[0].nsamps;
-    for (l = 0; l < bmeta[0].nlines; l++)
+    for (l = 0; l < bmeta[0].nlines; l += block_lines)
     {
-        if (l % 100 == 0)
-            printf ("Line %d\n", l);
+        block_lines = BIP_BLOCK_LINES;
+        if (l + block_lines > bmeta[0].nlines)
+            block_lines = bmeta[0].nlines - l;
+        block_pix = block_lines * bmeta[0].nsamps;
+        printf ("Line %d\n", l);
 
         for (i = 0; i < xml_metadata.nbands; i++)
         {
@@ -285,9 +298,9 @@ int convert_espa_to_raw_binary_bip
             if ((bmeta[0].data_type != bmeta[i].data_type) &&
                 (bmeta[i].data_type == ESPA_UINT8) && convert_qa)
             {
-                /* Read the current line from the raw binary file into the
+                /* Read the current lines from the raw binary file into the
                    temporary UINT8 buffer */
-                if (read_raw_binary (fp_rb[i], 1, bmeta[0].nsamps,
+                if (read_raw_binary (fp_rb[i], block_lines, bmeta[0].nsamps,
                     sizeof (uint8), tmp_buf_u8) != SUCCESS)
                 {
                     sprintf (errmsg, "Reading QA data from the raw binary "
@@ -299,22 +312,23 @@ int convert_espa_to_raw_binary_bip
                 /* Convert the data and write it to the output buffer */
                 if (bmeta[0].data_type == ESPA_INT16)
                 {
-                    curr_pix = i * bmeta[0].nsamps;
-                    for (s = 0; s < bmeta[0].nsamps; s++, curr_pix++)
+                    curr_pix = i * band_pix;
+                    for (s = 0; s < block_pix; s++, curr_pix++)
                         file_buf_i16[curr_pix] = (int16) tmp_buf_u8[s];
                 }
                 else if (bmeta[0].data_type == ESPA_UINT16)
                 {
-                    curr_pix = i * bmeta[0].nsamps;
-                    for (s = 0; s < bmeta[0].nsamps; s++, curr_pix++)
+                    curr_pix = i * band_pix;
+                    for (s = 0; s < block_pix; s++, curr_pix++)
                         file_buf_u16[curr_pix] = (uint16) tmp_buf_u8[s];
                 }
             }
             else
             {
-                /* Read the current line from the raw binary file */
-                if (read_raw_binary (fp_rb[i], 1, bmeta[0].nsamps, nbytes,
-                    file_buf + (i*nbytes_line)) != SUCCESS)
+                /* Read the current lines from the raw binary file */
+                if (read_raw_binary (fp_rb[i], block_lines, bmeta[0].nsamps,
+                    nbytes, file_buf + (i*BIP_BLOCK_LINES*nbytes_line))
+                    != SUCCESS)
                 {
                     sprintf (errmsg, "Reading image data from the raw binary "
                         "file for line %d and band %d", l, i);
@@ -324,14 +338,14 @@ int convert_espa_to_raw_binary_bip
             }
         }  /* end for i */
 
-        /* Loop through the samples and put each band for each pixel into the
-           output buffer */
-        for (s = 0; s < bmeta[0].nsamps; s++)
+        /* Loop through the pixels in the block and put each band for each
+           pixel into the output buffer */
+        for (s = 0; s < block_pix; s++)
         {
             curr_opix = s * xml_metadata.nbands;
             for (i = 0; i < xml_metadata.nbands; i++, curr_opix++)
             {
-                curr_ipix = i * bmeta[0].nsamps + s;
+                curr_ipix = i * band_pix + s;
                 if (bmeta[0].data_type == ESPA_UINT8)
                 {
                     ofile_buf_u8[curr_opix] = file_buf_u8[curr_ipix];
@@ -347,9 +361,9 @@ int convert_espa_to_raw_binary_bip
             }
         }
 
-        /* Write the current line of data containing all the bands to the
+        /* Write the current block of data containing all the bands to the
            output file */
-        number_elements = bmeta[0].nsamps * xml_metadata.nbands;
+        number_elements = block_pix * xml_metadata.nbands;
         if (fwrite (ofile_buf, nbytes, number_elements, fp_bip) !=
             number_elements)
         {
@@ -415,8 +429,10 @@ int convert_espa_to_raw_binary_bip
         error_handler (true, FUNC_NAME, errmsg);
         return (ERROR);
     }
-    cptr = strchr (envi_file, '.');
-    if (cptr != NULL)
+    /* Only a '.' after the last directory separator starts the file
+       extension */
+    cptr = strrchr (envi_file, '.');
+    if (cptr != NULL && strchr (cptr, '/') == NULL)
     {
         /* File extension found.  Replace it with the new extension */
         *cptr = '\0';
@@ -505,7 +521,7 @@ int convert_espa_to_raw_binary_bip
         return (ERROR);
     }
     cptr = strrchr (xml_file, '.');
-    if (cptr != NULL)
+    if (cptr != NULL && strchr (cptr, '/') == NULL)
     {
         /* File extension found.  Replace it with the new extension */
         *cptr = '\0';
@@ -27,6 +27,7 @@ NOTES:
 #include "envi_header.h"
 
 /* Defines */
+#define BIP_BLOCK_LINES 100  /* number of lines interleaved at a time */
 
 /* Prototypes */
 int convert_espa_to_raw_binary_bip
@@ -19,6 +19,115 @@ NOTES:
 #include <math.h>
 #include "convert_lpgs_to_espa.h"
 
+/* Band filename labels in the MTL file (minus the FILE_NAME_ prefix), along
+   with the category, band number, and thermal flag of the band */
+static struct
+{
+    char *label;     /* MTL label, without the FILE_NAME_ prefix */
+    char *category;  /* band category - qa, image */
+    char *band_num;  /* band number for the band name */
+    bool thermal;    /* is this band a thermal band? */
+} lpgs_file_names[] =
+{
+    {"BAND_1", "image", "1", false},
+    {"BAND_2", "image", "2", false},
+    {"BAND_3", "image", "3", false},
+    {"BAND_4", "image", "4", false},
+    {"BAND_5", "image", "5", false},
+    {"BAND_6", "image", "6", false},  /* thermal for TM */
+    {"BAND_7", "image", "7", false},
+    {"BAND_8", "image", "8", false},
+    {"BAND_6_VCID_1", "image", "61", true},  /* ETM+ thermal */
+    {"BAND_6_VCID_2", "image", "62", true},  /* ETM+ thermal */
+    {"BAND_9", "image", "9", false},
+    {"BAND_10", "image", "10", true},  /* TIRS */
+    {"BAND_11", "image", "11", true},  /* TIRS */
+    {"ANGLE_SENSOR_AZIMUTH_BAND_4", "qa", "vaa", false},
+    {"ANGLE_SENSOR_ZENITH_BAND_4", "qa", "vza", false},
+    {"ANGLE_SOLAR_AZIMUTH_BAND_4", "qa", "saa", false},
+    {"ANGLE_SOLAR_ZENITH_BAND_4", "qa", "sza", false},
+    {"QUALITY_L1_PIXEL", "qa", "qa_pixel", false},
+    {"QUALITY_L1_RADIOMETRIC_SATURATION", "qa", "qa_radsat", false}
+};
+#define NUM_LPGS_FILE_NAMES \
+    (int) (sizeof (lpgs_file_names) / sizeof (lpgs_file_names[0]))
+
+/* Corner labels in the MTL file (minus the CORNER_ prefix).  The order must
+   match the corner_values array in read_lpgs_mtl. */
+static const char *lpgs_corner_labels[] =
+{
+    "UL_LAT_PRODUCT", "UL_LON_PRODUCT", "LR_LAT_PRODUCT", "LR_LON_PRODUCT",
+    "UR_LAT_PRODUCT", "UR_LON_PRODUCT", "LL_LAT_PRODUCT", "LL_LON_PRODUCT",
+    "UL_PROJECTION_X_PRODUCT", "UL_PROJECTION_Y_PRODUCT",
+    "LR_PROJECTION_X_PRODUCT", "LR_PROJECTION_Y_PRODUCT"
+};
+#define NUM_LPGS_CORNERS \
+    (int) (sizeof (lpgs_corner_labels) / sizeof (lpgs_corner_labels[0]))
+
+/******************************************************************************
+MODULE:  lpgs_band_index
+
+PURPOSE: Map the band suffix of a per-band MTL label (i.e. the "7" in
+RADIANCE_MULT_BAND_7 or the "6_VCID_1" in RADIANCE_MULT_BAND_6_VCID_1) to the
+index of that band in the arrays used by read_lpgs_mtl.
+
+RETURN VALUE:
+Type = int
+Value           Description
+-----           -----------
+-1              Band suffix isn't one that is stored for this instrument
+0 - 10          Index of the band
+
+NOTES:
+1. Bands 7 and 8 depend on the instrument, since ETM+ has two band 6s.
+******************************************************************************/
+static int lpgs_band_index
+(
+    const char *band,        /* I: band suffix from the MTL label */
+    const char *instrument   /* I: instrument from the MTL file */
+)
+{
+    if (!strcmp (band, "6_VCID_1"))
+        return (5);
+    if (!strcmp (band, "6_VCID_2"))
+        return (6);
+
+    /* The rest of the suffixes are just the band number */
+    if (band[0] < '1' || band[0] > '9')
+        return (-1);
+    if (band[1] == '\0')
+    {
+        switch (band[0])
+        {
+            case '7':
+                if (!strcmp (instrument, "TM") ||
+                    !strcmp (instrument, "OLI_TIRS") ||
+                    !strcmp (instrument, "OLI"))
+                    return (6);
+                else if (!strncmp (instrument, "ETM", 3))
+                    return (7);
+                return (-1);
+
+            case '8':
+                if (!strcmp (instrument, "OLI_TIRS") ||
+                    !strcmp (instrument, "OLI"))
+                    return (7);
+                else if (!strncmp (instrument, "ETM", 3))
+                    return (8);
+                return (-1);
+
+            default:
+                return (band[0] - '1');
+        }
+    }
+    if (band[0] == '1' && (band[1] == '0' || band[1] == '1') &&
+        band[2] == '\0')
+        return (band[1] == '0' ? 9 : 10);
+
+    return (-1);
+}
+
+
 /******************************************************************************
 MODULE:  read_lpgs_mtl
 
@@ -56,6 +165,9 @@ int read_lpgs_mtl
     char band_num[MAX_LPGS_BANDS][STR_SIZE]; /* band number for band name */
     int i;                    /* looping variable */
     int count;                /* number of chars copied in snprintf */
+    int band_indx;            /* band index for the per-band MTL values */
+    int file_indx;            /* index in the table of band filename labels */
+    int corner_indx;          /* index in the table of corner labels */
     int band_count = 0;       /* count of the bands processed so we don't have
                                  to specify each band number directly, which
                                  get complicated as we are supporting TM, ETM+,
@@ -82,6 +194,15 @@ int read_lpgs_mtl
     Geo_bounds_t bounds;     /* image boundary for the scene */
     double ur_corner[2];     /* geographic UR lat, long */
     double ll_corner[2];     /* geographic LL lat, long */
+    double *corner_values[] =  /* where each of the lpgs_corner_labels is
+                                  stored, in the same order */
+    {
+        &gmeta->ul_corner[0], &gmeta->ul_corner[1],
+        &gmeta->lr_corner[0], &gmeta->lr_corner[1],
+        &ur_corner[0], &ur_corner[1], &ll_corner[0], &ll_corner[1],
+        &gmeta->proj_info.ul_corner[0], &gmeta->proj_info.ul_corner[1],
+        &gmeta->proj_info.lr_corner[0], &gmeta->proj_info.lr_corner[1]
+    };
     char band_fname[MAX_LPGS_BANDS][STR_SIZE];  /* filenames for each band */
     int band_min[MAX_LPGS_BANDS];  /* minimum value for each band */
     int band_max[MAX_LPGS_BANDS];  /* maximum value for each band */
@@ -100,7 +221,7 @@ int read_lpgs_mtl
     char buffer[STR_SIZE] = "\0";          /* line buffer from MTL file */
     char *label = NULL;                    /* label value in the line */
     char *tokenptr = NULL;                 /* pointer to process each line */
-    char *seperator = "=\" \t";            /* separator string */
+    char *seperator = "=\" \t\r\n";        /* separator string */
     float fnum;                            /* temporary variable for floating
                                               point numbers */
 
@@ -117,11 +238,8 @@ int read_lpgs_mtl
        be read since it falls after many of the other tokens in the MTL. */
     while (fgets (buffer, STR_SIZE, mtl_fptr) != NULL)
     {
-        /* If the last character is the end of line, then strip it off */
-        if (buffer[strlen(buffer)-1] == '\n')
-            buffer[strlen(buffer)-1] = '\0';
-
-        /* Get string token */
+        /* Get string token.  The end of line characters are separators,
+           so they don't need to be stripped off first. */
         tokenptr = strtok (buffer, seperator);
         label = tokenptr;
 
@@ -148,8 +266,9 @@ int read_lpgs_mtl
     /* Rewind the buffer to the start */
     rewind (mtl_fptr);
 
-    /* Make sure the sensor ID was found */
-    if (!gmeta->instrument)
+    /* Make sure the sensor ID was found.  The instrument is still the fill
+       value from init_metadata_struct if it wasn't. */
+    if (!strcmp (gmeta->instrument, ESPA_STRING_META_FILL))
     {
         sprintf (errmsg, "SENSOR ID was not found in the MTL file.");
         error_handler (true, FUNC_NAME, errmsg);
@@ -162,11 +281,8 @@ int read_lpgs_mtl
     done_with_mtl = false;
     while (fgets (buffer, STR_SIZE, mtl_fptr) != NULL)
     {
-        /* If the last character is the end of line, then strip it off */
-        if (buffer[strlen(buffer)-1] == '\n')
-            buffer[strlen(buffer)-1] = '\0';
-
-        /* Get string token */
+        /* Get string token.  The end of line characters are separators,
+           so they don't need to be stripped off first. */
         tokenptr = strtok (buffer, seperator);
         label = tokenptr;
  
@@ -277,32 +393,20 @@ int read_lpgs_mtl
             else if (!strcmp (label, "WRS_ROW"))
                 sscanf (tokenptr, "%d", &gmeta->wrs_row);
 
-            else if (!strcmp (label, "CORNER_UL_LAT_PRODUCT"))
-                sscanf (tokenptr, "%lf", &gmeta->ul_corner[0]);
-            else if (!strcmp (label, "CORNER_UL_LON_PRODUCT"))
-                sscanf (tokenptr, "%lf", &gmeta->ul_corner[1]);
-            else if (!strcmp (label, "CORNER_LR_LAT_PRODUCT"))
-                sscanf (tokenptr, "%lf", &gmeta->lr_corner[0]);
-            else if (!strcmp (label, "CORNER_LR_LON_PRODUCT"))
-                sscanf (tokenptr, "%lf", &gmeta->lr_corner[1]);
-
-            else if (!strcmp (label, "CORNER_UR_LAT_PRODUCT"))
-                sscanf (tokenptr, "%lf", &ur_corner[0]);
-            else if (!strcmp (label, "CORNER_UR_LON_PRODUCT"))
-                sscanf (tokenptr, "%lf", &ur_corner[1]);
-            else if (!strcmp (label, "CORNER_LL_LAT_PRODUCT"))
-                sscanf (tokenptr, "%lf", &ll_corner[0]);
-            else if (!strcmp (label, "CORNER_LL_LON_PRODUCT"))
-                sscanf (tokenptr, "%lf", &ll_corner[1]);
-
-            else if (!strcmp (label, "CORNER_UL_PROJECTION_X_PRODUCT"))
-                sscanf (tokenptr, "%lf", &gmeta->proj_info.ul_corner[0]);
-            else if (!strcmp (label, "CORNER_UL_PROJECTION_Y_PRODUCT"))
-                sscanf (tokenptr, "%lf", &gmeta->proj_info.ul_corner[1]);
-            else if (!strcmp (label, "CORNER_LR_PROJECTION_X_PRODUCT"))
-                sscanf (tokenptr, "%lf", &gmeta->proj_info.lr_corner[0]);
-            else if (!strcmp (label, "CORNER_LR_PROJECTION_Y_PRODUCT"))
-                sscanf (tokenptr, "%lf", &gmeta->proj_info.lr_corner[1]);
+            /* Geographic and projection corners all start with CORNER_, so
+               check the prefix once and look up the rest in the table */
+            else if (!strncmp (label, "CORNER_", 7))
+            {
+                for (corner_indx = 0; corner_indx < NUM_LPGS_CORNERS;
+                     corner_indx++)
+                {
+                    if (!strcmp (&label[7], lpgs_corner_labels[corner_indx]))
+                    {
+                        sscanf (tokenptr, "%lf", corner_values[corner_indx]);
+                        break;
+                    }
+                }
+            }
 
             else if (!strcmp (label, "REFLECTIVE_SAMPLES"))
                 sscanf (tokenptr, "%d", &tmp_bmeta.nsamps);
@@ -406,308 +510,19 @@ int read_lpgs_mtl
                been read, then assume all bands have been read and don't
                repeat the filename reads. The Collection 02 MTL has two
                locations for the same band filenames. */
-            else if (!strcmp (label, "FILE_NAME_BAND_1") && !all_bands_read)
-            {
-                count = snprintf (band_fname[band_count],
-                    sizeof (band_fname[band_count]), "%s", tokenptr);
-                if (count < 0 || count >= sizeof (band_fname[band_count]))
-                {
-                    sprintf (errmsg, "Overflow of band_fname[%d] string",
-                        band_count);
-                    error_handler (true, FUNC_NAME, errmsg);
-                    return (ERROR);
-                }
-                strcpy (category[band_count], "image");
-                strcpy (band_num[band_count], "1");
-                thermal[band_count] = false;
-                band_count++;  /* increment the band count */
-            }
-            else if (!strcmp (label, "FILE_NAME_BAND_2") && !all_bands_read)
-            {
-                count = snprintf (band_fname[band_count],
-                    sizeof (band_fname[band_count]), "%s", tokenptr);
-                if (count < 0 || count >= sizeof (band_fname[band_count]))
-                {
-                    sprintf (errmsg, "Overflow of band_fname[%d] string",
-                        band_count);
-                    error_handler (true, FUNC_NAME, errmsg);
-                    return (ERROR);
-                }
-                strcpy (category[band_count], "image");
-                strcpy (band_num[band_count], "2");
-                thermal[band_count] = false;
-                band_count++;  /* increment the band count */
-            }
-            else if (!strcmp (label, "FILE_NAME_BAND_3") && !all_bands_read)
-            {
-                count = snprintf (band_fname[band_count],
-                    sizeof (band_fname[band_count]), "%s", tokenptr);
-                if (count < 0 || count >= sizeof (band_fname[band_count]))
-                {
-                    sprintf (errmsg, "Overflow of band_fname[%d] string",
-                        band_count);
-                    error_handler (true, FUNC_NAME, errmsg);
-                    return (ERROR);
-                }
-                strcpy (category[band_count], "image");
-                strcpy (band_num[band_count], "3");
-                thermal[band_count] = false;
-                band_count++;  /* increment the band count */
-            }
-            else if (!strcmp (label, "FILE_NAME_BAND_4") && !all_bands_read)
-            {
-                count = snprintf (band_fname[band_count],
-                    sizeof (band_fname[band_count]), "%s", tokenptr);
-                if (count < 0 || count >= sizeof (band_fname[band_count]))
-                {
-                    sprintf (errmsg, "Overflow of band_fname[%d] string",
-                        band_count);
-                    error_handler (true, FUNC_NAME, errmsg);
-                    return (ERROR);
-                }
-                strcpy (category[band_count], "image");
-                strcpy (band_num[band_count], "4");
-                thermal[band_count] = false;
-                band_count++;  /* increment the band count */
-            }
-            else if (!strcmp (label, "FILE_NAME_BAND_5") && !all_bands_read)
-            {
-                count = snprintf (band_fname[band_count],
-                    sizeof (band_fname[band_count]), "%s", tokenptr);
-                if (count < 0 || count >= sizeof (band_fname[band_count]))
-                {
-                    sprintf (errmsg, "Overflow of band_fname[%d] string",
-                        band_count);
-                    error_handler (true, FUNC_NAME, errmsg);
-                    return (ERROR);
-                }
-                strcpy (category[band_count], "image");
-                strcpy (band_num[band_count], "5");
-                thermal[band_count] = false;
-                band_count++;  /* increment the band count */
-            }
-            else if (!strcmp (label, "FILE_NAME_BAND_6") && !all_bands_read)
-            {
-                count = snprintf (band_fname[band_count],
-                    sizeof (band_fname[band_count]), "%s", tokenptr);
-                if (count < 0 || count >= sizeof (band_fname[band_count]))
-                {
-                    sprintf (errmsg, "Overflow of band_fname[%d] string",
-                        band_count);
-                    error_handler (true, FUNC_NAME, errmsg);
-                    return (ERROR);
-                }
-                strcpy (category[band_count], "image");
-                strcpy (band_num[band_count], "6");
-                if (!strcmp (gmeta->instrument, "TM"))
-                    thermal[band_count] = true;  /* TM thermal */
-                else
-                    thermal[band_count] = false;
-                band_count++;  /* increment the band count */
-            }
-            else if (!strcmp (label, "FILE_NAME_BAND_7") && !all_bands_read)
-            {
-                count = snprintf (band_fname[band_count],
-                    sizeof (band_fname[band_count]), "%s", tokenptr);
-                if (count < 0 || count >= sizeof (band_fname[band_count]))
-                {
-                    sprintf (errmsg, "Overflow of band_fname[%d] string",
-                        band_count);
-                    error_handler (true, FUNC_NAME, errmsg);
-                    return (ERROR);
-                }
-                strcpy (&category[band_count][0], "image");
-                strcpy (&band_num[band_count][0], "7");
-                thermal[band_count] = false;
-                band_count++;  /* increment the band count */
-            }
-            else if (!strcmp (label, "FILE_NAME_BAND_8") && !all_bands_read)
-            {
-                count = snprintf (band_fname[band_count],
-                    sizeof (band_fname[band_count]), "%s", tokenptr);
-                if (count < 0 || count >= sizeof (band_fname[band_count]))
-                {
-                    sprintf (errmsg, "Overflow of band_fname[%d] string",
-                        band_count);
-                    error_handler (true, FUNC_NAME, errmsg);
-                    return (ERROR);
-                }
-                strcpy (category[band_count], "image");
-                strcpy (band_num[band_count], "8");
-                thermal[band_count] = false;
-                band_count++;  /* increment the band count */
-            }
-            else if (!strcmp (label, "FILE_NAME_BAND_6_VCID_1") &&
-                !all_bands_read)
-            {
-                count = snprintf (band_fname[band_count],
-                    sizeof (band_fname[band_count]), "%s", tokenptr);
-                if (count < 0 || count >= sizeof (band_fname[band_count]))
-                {
-                    sprintf (errmsg, "Overflow of band_fname[%d] string",
-                        band_count);
-                    error_handler (true, FUNC_NAME, errmsg);
-                    return (ERROR);
-                }
-                strcpy (category[band_count], "image");
-                strcpy (band_num[band_count], "61");
-                thermal[band_count] = true;  /* ETM+ thermal */
-                band_count++;  /* increment the band count */
-            }
-            else if (!strcmp (label, "FILE_NAME_BAND_6_VCID_2") &&
-                !all_bands_read)
+            else if (!strncmp (label, "FILE_NAME_", 10) && !all_bands_read)
             {
-                count = snprintf (band_fname[band_count],
-                    sizeof (band_fname[band_count]), "%s", tokenptr);
-                if (count < 0 || count >= sizeof (band_fname[band_count]))
-                {
-                    sprintf (errmsg, "Overflow of band_fname[%d] string",
-                        band_count);
-                    error_handler (true, FUNC_NAME, errmsg);
-                    return (ERROR);
-                }
-                strcpy (category[band_count], "image");
-                strcpy (band_num[band_count], "62");
-                thermal[band_count] = true;  /* ETM+ thermal */
-                band_count++;  /* increment the band count */
-            }
-            else if (!strcmp (label, "FILE_NAME_BAND_9") && !all_bands_read)
-            {
-                count = snprintf (band_fname[band_count],
-                    sizeof (band_fname[band_count]), "%s", tokenptr);
-                if (count < 0 || count >= sizeof (band_fname[band_count]))
-                {
-                    sprintf (errmsg, "Overflow of band_fname[%d] string",
-                        band_count);
-                    error_handler (true, FUNC_NAME, errmsg);
-                    return (ERROR);
-                }
-                strcpy (category[band_count], "image");
-                strcpy (band_num[band_count], "9");
-                thermal[band_count] = false;
-                band_count++;  /* increment the band count */
-            }
-            else if (!strcmp (label, "FILE_NAME_BAND_10") && !all_bands_read)
-            {
-                count = snprintf (band_fname[band_count],
-                    sizeof (band_fname[band_count]), "%s", tokenptr);
-                if (count < 0 || count >= sizeof (band_fname[band_count]))
+                /* Look up the band in the table of band filename labels.
+                   Filename labels not in the table are skipped. */
+                for (file_indx = 0; file_indx < NUM_LPGS_FILE_NAMES;
+                     file_indx++)
                 {
-                    sprintf (errmsg, "Overflow of band_fname[%d] string",
-                        band_count);
-                    error_handler (true, FUNC_NAME, errmsg);
-                    return (ERROR);
+                    if (!strcmp (&label[10], lpgs_file_names[file_indx].label))
+                        break;
                 }
-                strcpy (category[band_count], "image");
-                strcpy (band_num[band_count], "10");
-                thermal[band_count] = true;  /* TIRS */
-                band_count++;  /* increment the band count */
-            }
-            else if (!strcmp (label, "FILE_NAME_BAND_11") && !all_bands_read)
-            {
-                count = snprintf (band_fname[band_count],
-                    sizeof (band_fname[band_count]), "%s", tokenptr);
-                if (count < 0 || count >= sizeof (band_fname[band_count]))
-                {
-                    sprintf (errmsg, "Overflow of band_fname[%d] string",
-                        band_count);
-                    error_handler (true, FUNC_NAME, errmsg);
-                    return (ERROR);
-                }
-                strcpy (category[band_count], "image");
-                strcpy (band_num[band_count], "11");
-                thermal[band_count] = true;  /* TIRS */
-                band_count++;  /* increment the band count */
-            }
-            else if (!strcmp (label, "FILE_NAME_ANGLE_SENSOR_AZIMUTH_BAND_4") &&
-                !all_bands_read)
-            {
-                count = snprintf (band_fname[band_count],
-                    sizeof (band_fname[band_count]), "%s", tokenptr);
-                if (count < 0 || count >= sizeof (band_fname[band_count]))
-                {
-                    sprintf (errmsg, "Overflow of band_fname[%d] string",
-                        band_count);
-                    error_handler (true, FUNC_NAME, errmsg);
-                    return (ERROR);
-                }
-                strcpy (category[band_count], "qa");
-                strcpy (band_num[band_count], "vaa");
-                thermal[band_count] = false;
-                band_count++;  /* increment the band count */
-            }
-            else if (!strcmp (label, "FILE_NAME_ANGLE_SENSOR_ZENITH_BAND_4") &&
-                !all_bands_read)
-            {
-                count = snprintf (band_fname[band_count],
-                    sizeof (band_fname[band_count]), "%s", tokenptr);
-                if (count < 0 || count >= sizeof (band_fname[band_count]))
-                {
-                    sprintf (errmsg, "Overflow of band_fname[%d] string",
-                        band_count);
-                    error_handler (true, FUNC_NAME, errmsg);
-                    return (ERROR);
-                }
-                strcpy (category[band_count], "qa");
-                strcpy (band_num[band_count], "vza");
-                thermal[band_count] = false;
-                band_count++;  /* increment the band count */
-            }
-            else if (!strcmp (label, "FILE_NAME_ANGLE_SOLAR_AZIMUTH_BAND_4") &&
-                !all_bands_read)
-            {
-                count = snprintf (band_fname[band_count],
-                    sizeof (band_fname[band_count]), "%s", tokenptr);
-                if (count < 0 || count >= sizeof (band_fname[band_count]))
-                {
-                    sprintf (errmsg, "Overflow of band_fname[%d] string",
-                        band_count);
-                    error_handler (true, FUNC_NAME, errmsg);
-                    return (ERROR);
-                }
-                strcpy (category[band_count], "qa");
-                strcpy (band_num[band_count], "saa");
-                thermal[band_count] = false;
-                band_count++;  /* increment the band count */
-            }
-            else if (!strcmp (label, "FILE_NAME_ANGLE_SOLAR_ZENITH_BAND_4") &&
-                !all_bands_read)
-            {
-                count = snprintf (band_fname[band_count],
-                    sizeof (band_fname[band_count]), "%s", tokenptr);
-                if (count < 0 || count >= sizeof (band_fname[band_count]))
-                {
-                    sprintf (errmsg, "Overflow of band_fname[%d] string",
-                        band_count);
-                    error_handler (true, FUNC_NAME, errmsg);
-                    return (ERROR);
-                }
-                strcpy (category[band_count], "qa");
-                strcpy (band_num[band_count], "sza");
-                thermal[band_count] = false;
-                band_count++;  /* increment the band count */
-            }
-            else if (!strcmp (label, "FILE_NAME_QUALITY_L1_PIXEL") &&
-                !all_bands_read)
-            {
-                count = snprintf (band_fname[band_count],
-                    sizeof (band_fname[band_count]), "%s", tokenptr);
-                if (count < 0 || count >= sizeof (band_fname[band_count]))
-                {
-                    sprintf (errmsg, "Overflow of band_fname[%d] string",
-                        band_count);
-                    error_handler (true, FUNC_NAME, errmsg);
-                    return (ERROR);
-                }
-                strcpy (category[band_count], "qa");
-                strcpy (band_num[band_count], "qa_pixel");
-                thermal[band_count] = false;
-                band_count++;  /* increment the band count */
-            }
-            else if (!strcmp (label,
-                "FILE_NAME_QUALITY_L1_RADIOMETRIC_SATURATION") &&
-                !all_bands_read)
-            {
+                if (file_indx == NUM_LPGS_FILE_NAMES)
+                    continue;
+
                 count = snprintf (band_fname[band_count],
                     sizeof (band_fname[band_count]), "%s", tokenptr);
                 if (count < 0 || count >= sizeof (band_fname[band_count]))
@@ -717,281 +532,82 @@ int read_lpgs_mtl
                     error_handler (true, FUNC_NAME, errmsg);
                     return (ERROR);
                 }
-                strcpy (category[band_count], "qa");
-                strcpy (band_num[band_count], "qa_radsat");
-                thermal[band_count] = false;
+                strcpy (category[band_count],
+                    lpgs_file_names[file_indx].category);
+                strcpy (band_num[band_count],
+                    lpgs_file_names[file_indx].band_num);
+                thermal[band_count] = lpgs_file_names[file_indx].thermal;
+
+                /* Band 6 is only thermal for TM */
+                if (!strcmp (band_num[band_count], "6") &&
+                    !strcmp (gmeta->instrument, "TM"))
+                    thermal[band_count] = true;
                 band_count++;  /* increment the band count */
             }
 
-            /* Read the min pixel values */
-            else if (!strcmp (label, "QUANTIZE_CAL_MIN_BAND_1"))
-                sscanf (tokenptr, "%d", &band_min[0]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MIN_BAND_2"))
-                sscanf (tokenptr, "%d", &band_min[1]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MIN_BAND_3"))
-                sscanf (tokenptr, "%d", &band_min[2]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MIN_BAND_4"))
-                sscanf (tokenptr, "%d", &band_min[3]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MIN_BAND_5"))
-                sscanf (tokenptr, "%d", &band_min[4]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MIN_BAND_6"))
-                sscanf (tokenptr, "%d", &band_min[5]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MIN_BAND_7"))
-            {
-                if (!strcmp (gmeta->instrument, "TM") ||
-                    !strcmp (gmeta->instrument, "OLI_TIRS") ||
-                    !strcmp (gmeta->instrument, "OLI"))
-                    sscanf (tokenptr, "%d", &band_min[6]);
-                else if (!strncmp (gmeta->instrument, "ETM", 3))
-                    sscanf (tokenptr, "%d", &band_min[7]);
-            }
-            else if (!strcmp (label, "QUANTIZE_CAL_MIN_BAND_8"))
-            {
-                if (!strcmp (gmeta->instrument, "OLI_TIRS") ||
-                    !strcmp (gmeta->instrument, "OLI"))
-                    sscanf (tokenptr, "%d", &band_min[7]);
-                else if (!strncmp (gmeta->instrument, "ETM", 3))
-                    sscanf (tokenptr, "%d", &band_min[8]);
-            }
-            else if (!strcmp (label, "QUANTIZE_CAL_MIN_BAND_6_VCID_1"))
-                sscanf (tokenptr, "%d", &band_min[5]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MIN_BAND_6_VCID_2"))
-                sscanf (tokenptr, "%d", &band_min[6]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MIN_BAND_9"))
-                sscanf (tokenptr, "%d", &band_min[8]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MIN_BAND_10"))
-                sscanf (tokenptr, "%d", &band_min[9]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MIN_BAND_11"))
-                sscanf (tokenptr, "%d", &band_min[10]);
-
-            /* Read the max pixel values */
-            else if (!strcmp (label, "QUANTIZE_CAL_MAX_BAND_1"))
-                sscanf (tokenptr, "%d", &band_max[0]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MAX_BAND_2"))
-                sscanf (tokenptr, "%d", &band_max[1]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MAX_BAND_3"))
-                sscanf (tokenptr, "%d", &band_max[2]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MAX_BAND_4"))
-                sscanf (tokenptr, "%d", &band_max[3]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MAX_BAND_5"))
-                sscanf (tokenptr, "%d", &band_max[4]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MAX_BAND_6"))
-                sscanf (tokenptr, "%d", &band_max[5]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MAX_BAND_7"))
+            /* Read the per-band min/max pixel values, radiance and
+               reflectance gains/biases, and K1/K2 constants.  The band number
+               suffix of the label is mapped to the band index once, instead
+               of comparing the label against every band-specific name. */
+            else if (!strncmp (label, "QUANTIZE_CAL_MIN_BAND_", 22))
             {
-                if (!strcmp (gmeta->instrument, "TM") ||
-                    !strcmp (gmeta->instrument, "OLI_TIRS") ||
-                    !strcmp (gmeta->instrument, "OLI"))
-                    sscanf (tokenptr, "%d", &band_max[6]);
-                else if (!strncmp (gmeta->instrument, "ETM", 3))
-                    sscanf (tokenptr, "%d", &band_max[7]);
+                band_indx = lpgs_band_index (&label[22], gmeta->instrument);
+                if (band_indx >= 0)
+                    sscanf (tokenptr, "%d", &band_min[band_indx]);
             }
-            else if (!strcmp (label, "QUANTIZE_CAL_MAX_BAND_8"))
+            else if (!strncmp (label, "QUANTIZE_CAL_MAX_BAND_", 22))
             {
-                if (!strcmp (gmeta->instrument, "OLI_TIRS") ||
-                    !strcmp (gmeta->instrument, "OLI"))
-                    sscanf (tokenptr, "%d", &band_max[7]);
-                else if (!strncmp (gmeta->instrument, "ETM", 3))
-                    sscanf (tokenptr, "%d", &band_max[8]);
+                band_indx = lpgs_band_index (&label[22], gmeta->instrument);
+                if (band_indx >= 0)
+                    sscanf (tokenptr, "%d", &band_max[band_indx]);
             }
-            else if (!strcmp (label, "QUANTIZE_CAL_MAX_BAND_6_VCID_1"))
-                sscanf (tokenptr, "%d", &band_max[5]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MAX_BAND_6_VCID_2"))
-                sscanf (tokenptr, "%d", &band_max[6]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MAX_BAND_9"))
-                sscanf (tokenptr, "%d", &band_max[8]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MAX_BAND_10"))
-                sscanf (tokenptr, "%d", &band_max[9]);
-            else if (!strcmp (label, "QUANTIZE_CAL_MAX_BAND_11"))
-                sscanf (tokenptr, "%d", &band_max[10]);
-
-            /* Read the radiance gains */
-            else if (!strcmp (label, "RADIANCE_MULT_BAND_1"))
+            else if (!strncmp (label, "RADIANCE_MULT_BAND_", 19))
             {
-                sscanf (tokenptr, "%f", &band_gain[0]);
+                band_indx = lpgs_band_index (&label[19], gmeta->instrument);
+                if (band_indx >= 0)
+                    sscanf (tokenptr, "%f", &band_gain[band_indx]);
 
                 /* Assume that if gain value for band 1 is available, then
                    the gain and bias values for all bands will be available */
-                gain_bias_available = true;
-            }
-            else if (!strcmp (label, "RADIANCE_MULT_BAND_2"))
-                sscanf (tokenptr, "%f", &band_gain[1]);
-            else if (!strcmp (label, "RADIANCE_MULT_BAND_3"))
-                sscanf (tokenptr, "%f", &band_gain[2]);
-            else if (!strcmp (label, "RADIANCE_MULT_BAND_4"))
-                sscanf (tokenptr, "%f", &band_gain[3]);
-            else if (!strcmp (label, "RADIANCE_MULT_BAND_5"))
-                sscanf (tokenptr, "%f", &band_gain[4]);
-            else if (!strcmp (label, "RADIANCE_MULT_BAND_6"))
-                sscanf (tokenptr, "%f", &band_gain[5]);
-            else if (!strcmp (label, "RADIANCE_MULT_BAND_7"))
-            {
-                if (!strcmp (gmeta->instrument, "TM") ||
-                    !strcmp (gmeta->instrument, "OLI_TIRS") ||
-                    !strcmp (gmeta->instrument, "OLI"))
-                    sscanf (tokenptr, "%f", &band_gain[6]);
-                else if (!strncmp (gmeta->instrument, "ETM", 3))
-                    sscanf (tokenptr, "%f", &band_gain[7]);
-            }
-            else if (!strcmp (label, "RADIANCE_MULT_BAND_8"))
-            {
-                if (!strcmp (gmeta->instrument, "OLI_TIRS") ||
-                    !strcmp (gmeta->instrument, "OLI"))
-                    sscanf (tokenptr, "%f", &band_gain[7]);
-                else if (!strncmp (gmeta->instrument, "ETM", 3))
-                    sscanf (tokenptr, "%f", &band_gain[8]);
+                if (band_indx == 0)
+                    gain_bias_available = true;
             }
-            else if (!strcmp (label, "RADIANCE_MULT_BAND_6_VCID_1"))
-                sscanf (tokenptr, "%f", &band_gain[5]);
-            else if (!strcmp (label, "RADIANCE_MULT_BAND_6_VCID_2"))
-                sscanf (tokenptr, "%f", &band_gain[6]);
-            else if (!strcmp (label, "RADIANCE_MULT_BAND_9"))
-                sscanf (tokenptr, "%f", &band_gain[8]);
-            else if (!strcmp (label, "RADIANCE_MULT_BAND_10"))
-                sscanf (tokenptr, "%f", &band_gain[9]);
-            else if (!strcmp (label, "RADIANCE_MULT_BAND_11"))
-                sscanf (tokenptr, "%f", &band_gain[10]);
-
-            /* Read the radiance biases */
-            else if (!strcmp (label, "RADIANCE_ADD_BAND_1"))
-                sscanf (tokenptr, "%f", &band_bias[0]);
-            else if (!strcmp (label, "RADIANCE_ADD_BAND_2"))
-                sscanf (tokenptr, "%f", &band_bias[1]);
-            else if (!strcmp (label, "RADIANCE_ADD_BAND_3"))
-                sscanf (tokenptr, "%f", &band_bias[2]);
-            else if (!strcmp (label, "RADIANCE_ADD_BAND_4"))
-                sscanf (tokenptr, "%f", &band_bias[3]);
-            else if (!strcmp (label, "RADIANCE_ADD_BAND_5"))
-                sscanf (tokenptr, "%f", &band_bias[4]);
-            else if (!strcmp (label, "RADIANCE_ADD_BAND_6"))
-                sscanf (tokenptr, "%f", &band_bias[5]);
-            else if (!strcmp (label, "RADIANCE_ADD_BAND_7"))
+            else if (!strncmp (label, "RADIANCE_ADD_BAND_", 18))
             {
-                if (!strcmp (gmeta->instrument, "TM") ||
-                    !strcmp (gmeta->instrument, "OLI_TIRS") ||
-                    !strcmp (gmeta->instrument, "OLI"))
-                    sscanf (tokenptr, "%f", &band_bias[6]);
-                else if (!strncmp (gmeta->instrument, "ETM", 3))
-                    sscanf (tokenptr, "%f", &band_bias[7]);
+                band_indx = lpgs_band_index (&label[18], gmeta->instrument);
+                if (band_indx >= 0)
+                    sscanf (tokenptr, "%f", &band_bias[band_indx]);
             }
-            else if (!strcmp (label, "RADIANCE_ADD_BAND_8"))
+            else if (!strncmp (label, "REFLECTANCE_MULT_BAND_", 22))
             {
-                if (!strcmp (gmeta->instrument, "OLI_TIRS") ||
-                    !strcmp (gmeta->instrument, "OLI"))
-                    sscanf (tokenptr, "%f", &band_bias[7]);
-                else if (!strncmp (gmeta->instrument, "ETM", 3))
-                    sscanf (tokenptr, "%f", &band_bias[8]);
-            }
-            else if (!strcmp (label, "RADIANCE_ADD_BAND_6_VCID_1"))
-                sscanf (tokenptr, "%f", &band_bias[5]);
-            else if (!strcmp (label, "RADIANCE_ADD_BAND_6_VCID_2"))
-                sscanf (tokenptr, "%f", &band_bias[6]);
-            else if (!strcmp (label, "RADIANCE_ADD_BAND_9"))
-                sscanf (tokenptr, "%f", &band_bias[8]);
-            else if (!strcmp (label, "RADIANCE_ADD_BAND_10"))
-                sscanf (tokenptr, "%f", &band_bias[9]);
-            else if (!strcmp (label, "RADIANCE_ADD_BAND_11"))
-                sscanf (tokenptr, "%f", &band_bias[10]);
-
-            /* Read the reflectance gains */
-            else if (!strcmp (label, "REFLECTANCE_MULT_BAND_1"))
-            {
-                sscanf (tokenptr, "%f", &refl_gain[0]);
+                band_indx = lpgs_band_index (&label[22], gmeta->instrument);
+                if (band_indx >= 0)
+                    sscanf (tokenptr, "%f", &refl_gain[band_indx]);
 
                 /* Assume that if the reflectance gain value for band 1 is
                    available, then the gain and bias values for all bands will
                    be available */
-                refl_gain_bias_available = true;
+                if (band_indx == 0)
+                    refl_gain_bias_available = true;
             }
-            else if (!strcmp (label, "REFLECTANCE_MULT_BAND_2"))
-                sscanf (tokenptr, "%f", &refl_gain[1]);
-            else if (!strcmp (label, "REFLECTANCE_MULT_BAND_3"))
-                sscanf (tokenptr, "%f", &refl_gain[2]);
-            else if (!strcmp (label, "REFLECTANCE_MULT_BAND_4"))
-                sscanf (tokenptr, "%f", &refl_gain[3]);
-            else if (!strcmp (label, "REFLECTANCE_MULT_BAND_5"))
-                sscanf (tokenptr, "%f", &refl_gain[4]);
-            else if (!strcmp (label, "REFLECTANCE_MULT_BAND_6"))
-                sscanf (tokenptr, "%f", &refl_gain[5]);
-            else if (!strcmp (label, "REFLECTANCE_MULT_BAND_7"))
+            else if (!strncmp (label, "REFLECTANCE_ADD_BAND_", 21))
             {
-                if (!strcmp (gmeta->instrument, "TM") ||
-                    !strcmp (gmeta->instrument, "OLI_TIRS") ||
-                    !strcmp (gmeta->instrument, "OLI"))
-                    sscanf (tokenptr, "%f", &refl_gain[6]);
-                else if (!strncmp (gmeta->instrument, "ETM", 3))
-                    sscanf (tokenptr, "%f", &refl_gain[7]);
+                band_indx = lpgs_band_index (&label[21], gmeta->instrument);
+                if (band_indx >= 0)
+                    sscanf (tokenptr, "%f", &refl_bias[band_indx]);
             }
-            else if (!strcmp (label, "REFLECTANCE_MULT_BAND_8"))
+            else if (!strncmp (label, "K1_CONSTANT_BAND_", 17))
             {
-                if (!strcmp (gmeta->instrument, "OLI_TIRS") ||
-                    !strcmp (gmeta->instrument, "OLI"))
-                    sscanf (tokenptr, "%f", &refl_gain[7]);
-                else if (!strncmp (gmeta->instrument, "ETM", 3))
-                    sscanf (tokenptr, "%f", &refl_gain[8]);
+                band_indx = lpgs_band_index (&label[17], gmeta->instrument);
+                if (band_indx >= 0)
+                    sscanf (tokenptr, "%f", &k1[band_indx]);
             }
-            else if (!strcmp (label, "REFLECTANCE_MULT_BAND_9"))
-                sscanf (tokenptr, "%f", &refl_gain[8]);
-
-            /* Read the reflectance biases */
-            else if (!strcmp (label, "REFLECTANCE_ADD_BAND_1"))
-                sscanf (tokenptr, "%f", &refl_bias[0]);
-            else if (!strcmp (label, "REFLECTANCE_ADD_BAND_2"))
-                sscanf (tokenptr, "%f", &refl_bias[1]);
-            else if (!strcmp (label, "REFLECTANCE_ADD_BAND_3"))
-                sscanf (tokenptr, "%f", &refl_bias[2]);
-            else if (!strcmp (label, "REFLECTANCE_ADD_BAND_4"))
-                sscanf (tokenptr, "%f", &refl_bias[3]);
-            else if (!strcmp (label, "REFLECTANCE_ADD_BAND_5"))
-                sscanf (tokenptr, "%f", &refl_bias[4]);
-            else if (!strcmp (label, "REFLECTANCE_ADD_BAND_6"))
-                sscanf (tokenptr, "%f", &refl_bias[5]);
-            else if (!strcmp (label, "REFLECTANCE_ADD_BAND_7"))
+            else if (!strncmp (label, "K2_CONSTANT_BAND_", 17))
             {
-                if (!strcmp (gmeta->instrument, "TM") ||
-                    !strcmp (gmeta->instrument, "OLI_TIRS") ||
-                    !strcmp (gmeta->instrument, "OLI"))
-                    sscanf (tokenptr, "%f", &refl_bias[6]);
-                else if (!strncmp (gmeta->instrument, "ETM", 3))
-                    sscanf (tokenptr, "%f", &refl_bias[7]);
+                band_indx = lpgs_band_index (&label[17], gmeta->instrument);
+                if (band_indx >= 0)
+                    sscanf (tokenptr, "%f", &k2[band_indx]);
             }
-            else if (!strcmp (label, "REFLECTANCE_ADD_BAND_8"))
-            {
-                if (!strcmp (gmeta->instrument, "OLI_TIRS") ||
-                    !strcmp (gmeta->instrument, "OLI"))
-                    sscanf (tokenptr, "%f", &refl_bias[7]);
-                else if (!strncmp (gmeta->instrument, "ETM", 3))
-                    sscanf (tokenptr, "%f", &refl_bias[8]);
-            }
-            else if (!strcmp (label, "REFLECTANCE_ADD_BAND_9"))
-                sscanf (tokenptr, "%f", &refl_bias[8]);
-
-            /* Read the K1, K2 constants */
-            /* TIRS */
-            else if (!strcmp (label, "K1_CONSTANT_BAND_10"))
-                sscanf (tokenptr, "%f", &k1[9]);
-            else if (!strcmp (label, "K1_CONSTANT_BAND_11"))
-                sscanf (tokenptr, "%f", &k1[10]);
-            else if (!strcmp (label, "K2_CONSTANT_BAND_10"))
-                sscanf (tokenptr, "%f", &k2[9]);
-            else if (!strcmp (label, "K2_CONSTANT_BAND_11"))
-                sscanf (tokenptr, "%f", &k2[10]);
-
-            /* ETM+ */
-            else if (!strcmp (label, "K1_CONSTANT_BAND_6_VCID_1"))
-                sscanf (tokenptr, "%f", &k1[5]);
-            else if (!strcmp (label, "K1_CONSTANT_BAND_6_VCID_2"))
-                sscanf (tokenptr, "%f", &k1[6]);
-            else if (!strcmp (label, "K2_CONSTANT_BAND_6_VCID_1"))
-                sscanf (tokenptr, "%f", &k2[5]);
-            else if (!strcmp (label, "K2_CONSTANT_BAND_6_VCID_2"))
-                sscanf (tokenptr, "%f", &k2[6]);
-
-            /* TM */
-            else if (!strcmp (label, "K1_CONSTANT_BAND_6"))
-                sscanf (tokenptr, "%f", &k1[5]);
-            else if (!strcmp (label, "K2_CONSTANT_BAND_6"))
-                sscanf (tokenptr, "%f", &k2[5]);
 
             /* Catch the end of the file */
             else if (!strcmp (label, "END"))
@@ -1535,51 +1151,62 @@ int convert_gtif_to_img
 {
     char FUNC_NAME[] = "convert_gtif_to_img";  /* function name */
     char errmsg[STR_SIZE];    /* error message */
-    char gdal_cmd[STR_SIZE];  /* command string for GDAL call */
-    char tmpfile[STR_SIZE];   /* filename of file.img.aux.xml */
+    char nodata[STR_SIZE];    /* fill value string for the nodata tag */
+    char *gdal_args[18];      /* command and arguments for the GDAL call */
+    int nargs = 0;            /* number of arguments in gdal_args */
     int count;                /* number of chars copied in snprintf */
 
-    /* Check if the fill value is defined */
-    if ((int) bmeta->fill_value == (int) ESPA_INT_META_FILL)
-    {
-        /* Fill value is not defined so don't write the nodata tag */
-        count = snprintf (gdal_cmd, sizeof (gdal_cmd),
-            "gdal_translate -of Envi -q %s %s", gtif_file, bmeta->file_name);
-    }
-    else
+    /* Set up the GDAL call.  GDAL_PAM_ENABLED is turned off so the
+       {img_name}.aux.xml file, which isn't needed, is never written in the
+       first place.  The GeoTIFF doesn't need any sidecar files, so GDAL
+       isn't allowed to list the (possibly large) scene directory looking
+       for them when the file is opened. */
+    gdal_args[nargs++] = "gdal_translate";
+    gdal_args[nargs++] = "--config";
+    gdal_args[nargs++] = "GDAL_PAM_ENABLED";
+    gdal_args[nargs++] = "NO";
+    gdal_args[nargs++] = "--config";
+    gdal_args[nargs++] = "GDAL_DISABLE_READDIR_ON_OPEN";
+    gdal_args[nargs++] = "EMPTY_DIR";
+#ifndef _OPENMP
+    /* The Cloud Optimized GeoTIFFs are compressed, and GDAL can decode
+       their tiles on all cores.  When threading is enabled the bands are
+       already converted in parallel, so leave GDAL single threaded then to
+       avoid oversubscribing the CPUs. */
+    gdal_args[nargs++] = "--config";
+    gdal_args[nargs++] = "GDAL_NUM_THREADS";
+    gdal_args[nargs++] = "ALL_CPUS";
+#endif
+    gdal_args[nargs++] = "-of";
+    gdal_args[nargs++] = "Envi";
+    gdal_args[nargs++] = "-q";
+
+    /* Check if the fill value is defined.  If not, then don't write the
+       nodata tag. */
+    if ((int) bmeta->fill_value != (int) ESPA_INT_META_FILL)
     {
         /* Fill value is defined so use the nodata tag */
-        count = snprintf (gdal_cmd, sizeof (gdal_cmd),
-         "gdal_translate -of Envi -a_nodata %ld -q %s %s",
-            bmeta->fill_value, gtif_file, bmeta->file_name);
-    }
-    if (count < 0 || count >= sizeof (gdal_cmd))
-    {
-        sprintf (errmsg, "Overflow of gdal_cmd string");
-        error_handler (true, FUNC_NAME, errmsg);
-        return (ERROR);
+        count = snprintf (nodata, sizeof (nodata), "%ld", bmeta->fill_value);
+        if (count < 0 || count >= sizeof (nodata))
+        {
+            sprintf (errmsg, "Overflow of nodata string");
+            error_handler (true, FUNC_NAME, errmsg);
+            return (ERROR);
+        }
+        gdal_args[nargs++] = "-a_nodata";
+        gdal_args[nargs++] = nodata;
     }
+    gdal_args[nargs++] = gtif_file;
+    gdal_args[nargs++] = bmeta->file_name;
+    gdal_args[nargs] = NULL;
  
-    if (system (gdal_cmd) == -1)
+    if (run_cmd (gdal_args) != SUCCESS)
     {
-        sprintf (errmsg, "Running gdal_translate: %s", gdal_cmd);
+        sprintf (errmsg, "Running gdal_translate on %s", gtif_file);
         error_handler (true, FUNC_NAME, errmsg);
         return (ERROR);
     }
  
-    /* Remove the {gtif_name}.tif.aux.xml file since it's not needed and
-       clutters the results.  Don't worry about testing the unlink
-       results.  If it doesn't unlink it's not fatal. */
-    count = snprintf (tmpfile, sizeof (tmpfile), "%s.aux.xml",
-        bmeta->file_name);
-    if (count < 0 || count >= sizeof (tmpfile))
-    {
-        sprintf (errmsg, "Overflow of tmpfile string");
-        error_handler (true, FUNC_NAME, errmsg);
-        return (ERROR);
-    }
-    unlink (tmpfile);
-
     /* Successful conversion */
     return (SUCCESS);
 }
@@ -1617,6 +1244,7 @@ int convert_lpgs_to_espa
                                 populated by reading the MTL metadata file */
     int i;                   /* looping variable */
     int nlpgs_bands;         /* number of bands in the LPGS product */
+    int status = SUCCESS;    /* status for multi-threaded area */
     char lpgs_bands[MAX_LPGS_BANDS][STR_SIZE];  /* array containing the file
                                 names of the LPGS bands */
 
@@ -1646,7 +1274,11 @@ int convert_lpgs_to_espa
         return (ERROR);
     }
 
-    /* Convert each of the LPGS GeoTIFF files to raw binary */
+    /* Convert each of the LPGS GeoTIFF files to raw binary.  Each band is
+       independent of the others, so the conversions can run in parallel. */
+#ifdef _OPENMP
+    #pragma omp parallel for private (i, errmsg)
+#endif
     for (i = 0; i < nlpgs_bands; i++)
     {
         printf ("  Band %d: %s to %s\n", i, lpgs_bands[i],
@@ -1656,17 +1288,32 @@ int convert_lpgs_to_espa
         {
             sprintf (errmsg, "Converting band %d: %s", i, lpgs_bands[i]);
             error_handler (true, FUNC_NAME, errmsg);
-            return (ERROR);
+#ifdef _OPENMP
+            #pragma omp atomic write
+#endif
+            status = ERROR;
         }
+    }
+
+    if (status == ERROR)
+    {
+        free_metadata (&xml_metadata);
+        return (ERROR);
+    }
 
-        /* Remove the source file if specified */
-        if (del_src)
+    /* Remove the source files if specified.  This is only done once every
+       band has been converted, so a failed conversion leaves all of its
+       inputs in place. */
+    if (del_src)
+    {
+        for (i = 0; i < nlpgs_bands; i++)
         {
             printf ("  Removing %s\n", lpgs_bands[i]);
             if (unlink (lpgs_bands[i]) != 0)
             {
                 sprintf (errmsg, "Deleting source file: %s", lpgs_bands[i]);
                 error_handler (true, FUNC_NAME, errmsg);
+                free_metadata (&xml_metadata);
                 return (ERROR);
             }
         }
@@ -26,6 +26,7 @@ NOTES:
 #include "raw_binary_io.h"
 #include "write_metadata.h"
 #include "envi_header.h"
+#include "run_cmd.h"
 
 /* Defines */
 /* Maximum number of LPGS bands in a file; OLI/TIRS products have the most
@@ -218,10 +218,10 @@ printf ("DEBUG: s2_tile: %s\n", s2_tile);
 
 
 /******************************************************************************
-MODULE:  convert_jp2_to_img
+MODULE:  convert_jp2_band
 
-PURPOSE: Convert the Sentinel JP2 bands to an ESPA raw binary (.img) file,
-and generate the ENVI header file.
+PURPOSE: Convert a single Sentinel JP2 band to an ESPA raw binary (.img) file
+and update the band filename in the metadata.
 
 RETURN VALUE:
 Type = int
@@ -232,76 +232,136 @@ SUCCESS         Successfully converted JP2 file
 
 NOTES:
 ******************************************************************************/
-int convert_jp2_to_img
+int convert_jp2_band
 (
-    Espa_internal_meta_t *xml_metadata /* I: valid ESPA metadata structure */
+    Espa_band_meta_t *bmeta    /* I/O: pointer to band metadata for this band;
+                                       file_name is updated to the .img */
 )
 {
-    char FUNC_NAME[] = "convert_jp2_to_img";  /* function name */
+    char FUNC_NAME[] = "convert_jp2_band";  /* function name */
     char errmsg[STR_SIZE];    /* error message */
     char *cptr = NULL;        /* pointer to the file extension */
-    char envi_file[STR_SIZE]; /* name of the output ENVI header file */
     char raw_file[STR_SIZE];  /* name of the output raw binary file (.raw) */
-    char jp2_cmd[STR_SIZE];   /* command string for opj_decompress */
-    int i;                    /* looping variable for bands in XML file */
+    char *gdal_args[15];      /* command and arguments for the GDAL call */
+    int nargs = 0;            /* number of arguments in gdal_args */
     int count;                /* number of chars copied in snprintf */
-    Envi_header_t envi_hdr;   /* output ENVI header information */
-    Espa_band_meta_t *bmeta = NULL;  /* pointer to band metadata */
-    Espa_global_meta_t *gmeta = &xml_metadata->global;  /* global metadata */
 
-    // TODO: execute this in the loop below for better error handling
-    strcpy (jp2_cmd, "for i in *.jp2; do gdal_translate -of ENVI $i ${i%.jp2}; done");
-    if (system (jp2_cmd) == -1)
+    /* Decompress the JP2 band to an ENVI file named without the jp2
+       extension */
+    count = snprintf (raw_file, sizeof (raw_file), "%s", bmeta->file_name);
+    if (count < 0 || count >= sizeof (raw_file))
     {
-        sprintf (errmsg, "Decompressing JP2 files: %s. Make sure the current "
-            "directory is writable and the GDAL gdal_translate tool is in "
-            "your system PATH", jp2_cmd);
+        sprintf (errmsg, "Overflow of raw_file string");
         error_handler (true, FUNC_NAME, errmsg);
         return (ERROR);
     }
+    cptr = strrchr (raw_file, '.');
+    if (cptr == NULL)
+    {
+        sprintf (errmsg, "No file extension found in the Sentinel JP2 "
+            "file: %s\n", bmeta->file_name);
+        error_handler (true, FUNC_NAME, errmsg);
+        return (ERROR);
+    }
+    *cptr = '\0';
 
-    /* Loop through the bands in the metadata file and convert each one to
-       the ESPA format */
-    for (i = 0; i < xml_metadata->nbands; i++)
+    gdal_args[nargs++] = "gdal_translate";
+#ifndef _OPENMP
+    /* The GDAL JP2 drivers decode tiles in parallel when GDAL_NUM_THREADS
+       is set, which keeps every core busy on the band.  When threading is
+       enabled the bands are already converted in parallel, so leave GDAL
+       single threaded then to avoid oversubscribing the CPUs. */
+    gdal_args[nargs++] = "--config";
+    gdal_args[nargs++] = "GDAL_NUM_THREADS";
+    gdal_args[nargs++] = "ALL_CPUS";
+#endif
+    /* The JP2 band doesn't need any sidecar files, so don't let GDAL list
+       the directory looking for them when the file is opened */
+    gdal_args[nargs++] = "--config";
+    gdal_args[nargs++] = "GDAL_PAM_ENABLED";
+    gdal_args[nargs++] = "NO";
+    gdal_args[nargs++] = "--config";
+    gdal_args[nargs++] = "GDAL_DISABLE_READDIR_ON_OPEN";
+    gdal_args[nargs++] = "EMPTY_DIR";
+    gdal_args[nargs++] = "-of";
+    gdal_args[nargs++] = "ENVI";
+    gdal_args[nargs++] = bmeta->file_name;
+    gdal_args[nargs++] = raw_file;
+    gdal_args[nargs] = NULL;
+
+    if (run_cmd (gdal_args) != SUCCESS)
     {
-        /* Set up the band metadata pointer */
-        bmeta = &xml_metadata->band[i];
+        sprintf (errmsg, "Decompressing JP2 file: %s. Make sure the "
+            "current directory is writable and the GDAL gdal_translate "
+            "tool is in your system PATH", bmeta->file_name);
+        error_handler (true, FUNC_NAME, errmsg);
+        return (ERROR);
+    }
 
-        /* Determine the name of the output raw binary file.  Replace the
-           jp2 file extension with img in the Sentinel filenames. */
-        cptr = strrchr (bmeta->file_name, '.');
-        if (cptr == NULL)
-        {
-            sprintf (errmsg, "No file extension found in the Sentinel JP2 "
-                "file: %s\n", bmeta->file_name);
-            error_handler (true, FUNC_NAME, errmsg);
-            return (ERROR);
-        }
-        strcpy (cptr, ".img");
+    /* Replace the jp2 file extension with img in the Sentinel filename */
+    cptr = strrchr (bmeta->file_name, '.');
+    strcpy (cptr, ".img");
 
-        /* Rename the ENVI data files from the gdal_translate to .img files */
-        count = snprintf (raw_file, sizeof (raw_file), "%s", bmeta->file_name);
-        if (count < 0 || count >= sizeof (raw_file))
-        {
-            sprintf (errmsg, "Overflow of raw_file string");
-            error_handler (true, FUNC_NAME, errmsg);
-            return (ERROR);
-        }
-        cptr = strrchr (raw_file, '.');
-        strcpy (cptr, "\0");
+    /* Rename the ENVI data file from the gdal_translate to .img file */
+    if (rename (raw_file, bmeta->file_name))
+    {
+        sprintf (errmsg, "Unable to rename the decompressed Sentinel raw "
+            "file (%s) to the new ESPA filename (%s)", raw_file,
+            bmeta->file_name);
+        error_handler (true, FUNC_NAME, errmsg);
+        return (ERROR);
+    }
+
+    /* Successful conversion */
+    return (SUCCESS);
+}
+
+
+/******************************************************************************
+MODULE:  convert_jp2_to_img
+
+PURPOSE: Convert the Sentinel JP2 bands to an ESPA raw binary (.img) file,
+and generate the ENVI header file.
 
-        if (rename (raw_file, bmeta->file_name))
+RETURN VALUE:
+Type = int
+Value           Description
+-----           -----------
+ERROR           Error converting the JP2 file
+SUCCESS         Successfully converted JP2 file
+
+NOTES:
+  1. Only the bands in the metadata are converted, which skips the TCI
+     image.
+******************************************************************************/
+int convert_jp2_to_img
+(
+    Espa_internal_meta_t *xml_metadata /* I: valid ESPA metadata structure */
+)
+{
+    char FUNC_NAME[] = "convert_jp2_to_img";  /* function name */
+    char errmsg[STR_SIZE];    /* error message */
+    int i;                    /* looping variable for bands in XML file */
+    int status = SUCCESS;     /* return status */
+
+    /* Loop through the bands in the metadata file and convert each one to
+       the ESPA format.  Each band is independent of the others, so the
+       conversions can run in parallel. */
+#ifdef _OPENMP
+    #pragma omp parallel for private (i, errmsg)
+#endif
+    for (i = 0; i < xml_metadata->nbands; i++)
+    {
+        if (convert_jp2_band (&xml_metadata->band[i]) != SUCCESS)
         {
-            sprintf (errmsg, "Unable to rename the decompressed Sentinel raw "
-                "file (%s) to the new ESPA filename (%s)", raw_file,
-                bmeta->file_name);
+            sprintf (errmsg, "Converting band %d: %s", i,
+                xml_metadata->band[i].file_name);
             error_handler (true, FUNC_NAME, errmsg);
-            return (ERROR);
+            status = ERROR;
         }
     }  /* end for */
 
-    /* Successful conversion */
-    return (SUCCESS);
+    return (status);
 }
 
 
@@ -25,6 +25,7 @@ NOTES:
 #include "write_metadata.h"
 #include "envi_header.h"
 #include "parse_sentinel_metadata.h"
+#include "run_cmd.h"
 
 /* Defines */
 /* number of Sentinel bands in an L1C product; ignore TCI */
@@ -0,0 +1,105 @@
+/*****************************************************************************
+FILE: run_cmd.c
+  
+PURPOSE: Contains functions for running external commands, such as the GDAL
+tools, from the format conversion libraries.
+
+PROJECT:  Land Satellites Data System Science Research and Development (LSRD)
+at the USGS EROS
+
+LICENSE TYPE:  NASA Open Source Agreement Version 1.3
+
+NOTES:
+*****************************************************************************/
+#include <errno.h>
+#include <spawn.h>
+#include <sys/types.h>
+#include <sys/wait.h>
+#include "run_cmd.h"
+
+extern char **environ;
+
+/******************************************************************************
+MODULE:  run_cmd
+
+PURPOSE: Runs the specified command and waits for it to complete.  The command
+is started directly via posix_spawnp instead of system(), so no intermediate
+shell is started for each command and the arguments do not need to be quoted.
+
+RETURN VALUE:
+Type = int
+Value           Description
+-----           -----------
+ERROR           Error starting the command, waiting for it to complete, or
+                the command itself failed
+SUCCESS         Successfully ran the command
+
+NOTES:
+  1. argv[0] is the name of the command to be run, which is searched for in
+     the PATH.  The argument list must be terminated by a NULL pointer.
+  2. posix_spawnp is safe to call from multiple threads, unlike system(), so
+     this may be used from within OpenMP parallel regions.
+  3. The command is considered to have failed if it exits with a non-zero
+     status or is killed by a signal.
+  4. The command writes straight to the inherited stdout and stderr, so its
+     output is never held in memory here.  Our own buffered stdout is
+     flushed first, so messages already printed show up ahead of the
+     command's output when stdout is redirected to a log file.
+******************************************************************************/
+int run_cmd
+(
+    char *const argv[]    /* I: command name followed by its arguments,
+                                terminated by a NULL pointer */
+)
+{
+    char FUNC_NAME[] = "run_cmd";  /* function name */
+    char errmsg[STR_SIZE];    /* error message */
+    int status;               /* return status from posix_spawnp */
+    int wait_status;          /* status of the command from waitpid */
+    pid_t pid;                /* process ID of the command */
+
+    /* Flush anything we've printed so far, so it isn't written out after
+       the command's own output */
+    fflush (stdout);
+
+    /* Start the command */
+    status = posix_spawnp (&pid, argv[0], NULL, NULL, argv, environ);
+    if (status != 0)
+    {
+        snprintf (errmsg, sizeof (errmsg), "Starting %s: %s", argv[0],
+            strerror (status));
+        error_handler (true, FUNC_NAME, errmsg);
+        return (ERROR);
+    }
+
+    /* Wait for the command to complete */
+    while (waitpid (pid, &wait_status, 0) == -1)
+    {
+        if (errno != EINTR)
+        {
+            snprintf (errmsg, sizeof (errmsg), "Waiting on %s: %s", argv[0],
+                strerror (errno));
+            error_handler (true, FUNC_NAME, errmsg);
+            return (ERROR);
+        }
+    }
+
+    /* Make sure the command itself ran successfully */
+    if (WIFSIGNALED (wait_status))
+    {
+        snprintf (errmsg, sizeof (errmsg), "%s was terminated by signal %d",
+            argv[0], WTERMSIG (wait_status));
+        error_handler (true, FUNC_NAME, errmsg);
+        return (ERROR);
+    }
+    if (!WIFEXITED (wait_status) || WEXITSTATUS (wait_status) != 0)
+    {
+        snprintf (errmsg, sizeof (errmsg), "%s exited with status %d",
+            argv[0], WEXITSTATUS (wait_status));
+        error_handler (true, FUNC_NAME, errmsg);
+        return (ERROR);
+    }
+
+    /* Successful run */
+    return (SUCCESS);
+}
@@ -0,0 +1,31 @@
+/*****************************************************************************
+FILE: run_cmd.h
+  
+PURPOSE: Contains defines and prototypes for running external commands, such
+as the GDAL tools, from the format conversion libraries.
+
+PROJECT:  Land Satellites Data System Science Research and Development (LSRD)
+at the USGS EROS
+
+LICENSE TYPE:  NASA Open Source Agreement Version 1.3
+
+NOTES:
+*****************************************************************************/
+
+#ifndef RUN_CMD_H
+#define RUN_CMD_H
+
+#include <stdlib.h>
+#include <stdio.h>
+#include <string.h>
+#include "espa_common.h"
+#include "error_handler.h"
+
+/* Prototypes */
+int run_cmd
+(
+    char *const argv[]    /* I: command name followed by its arguments,
+                                terminated by a NULL pointer */
+);
+
+#endif
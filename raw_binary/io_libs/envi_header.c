@@ -11,6 +11,7 @@ LICENSE TYPE:  NASA Open Source Agreement Version 1.3
 NOTES:
 *****************************************************************************/
 
+#include <unistd.h>
 #include "envi_header.h"
 
 /******************************************************************************
@@ -53,7 +54,10 @@ int write_envi_hdr
                                        info section */
     char spheroid_str[STR_SIZE];  /* string for the spheroid code */
     char utm_projcs[STR_SIZE];    /* string for UTM projected coord system */
+    char tmp_file[STR_SIZE];      /* temporary header file being written */
     int i;                        /* looping variable */
+    int count;                    /* number of chars copied in snprintf */
+    int write_error;              /* error flag for the header stream */
     double semi_major_axis=-99.0; /* semi-major axis for the spheroid */
     double semi_minor_axis=-99.0; /* semi-minor axis for the spheroid */
     double inv_flattening=-99.0;  /* inverse flattening for the spheroid */
@@ -61,15 +65,6 @@ int write_envi_hdr
     double utm_cent_meridian=-99.0;  /* central meridian for UTM */
     FILE *hdr_fptr = NULL;        /* file pointer to the ENVI header file */
 
-    /* Open the header file */
-    hdr_fptr = fopen (hdr_file, "w");
-    if (hdr_fptr == NULL)
-    {
-        sprintf (errmsg, "Opening %s for write access.", hdr_file);
-        error_handler (true, FUNC_NAME, errmsg);
-        return (ERROR);
-    }
-
     /* Verify the projection is GEO, UTM, ALBERS, PS, or SIN and datum is
        WGS-84 */
     if (hdr->proj_type != GCTP_GEO_PROJ &&
@@ -150,6 +145,26 @@ int write_envi_hdr
             break;
     }
 
+    /* Open a temporary header file.  This is done only after the projection
+       and datum have been verified, and the header is renamed into place
+       once it is complete, so a failure never leaves an empty or partial
+       header file behind. */
+    count = snprintf (tmp_file, sizeof (tmp_file), "%s.tmp", hdr_file);
+    if (count < 0 || count >= sizeof (tmp_file))
+    {
+        sprintf (errmsg, "Overflow of tmp_file string");
+        error_handler (true, FUNC_NAME, errmsg);
+        return (ERROR);
+    }
+
+    hdr_fptr = fopen (tmp_file, "w");
+    if (hdr_fptr == NULL)
+    {
+        sprintf (errmsg, "Opening %s for write access.", tmp_file);
+        error_handler (true, FUNC_NAME, errmsg);
+        return (ERROR);
+    }
+
     /* Write the header to the file */
     fprintf (hdr_fptr,
         "ENVI\n"
@@ -345,8 +360,24 @@ int write_envi_hdr
         fprintf (hdr_fptr, ", %s", hdr->band_names[i]);
     fprintf (hdr_fptr, "}\n");
 
-    /* Close the header file */
-    fclose (hdr_fptr);
+    /* Close the header file, making sure everything was written */
+    write_error = ferror (hdr_fptr);
+    if (fclose (hdr_fptr) != 0 || write_error)
+    {
+        sprintf (errmsg, "Writing the ENVI header file: %s", tmp_file);
+        error_handler (true, FUNC_NAME, errmsg);
+        unlink (tmp_file);
+        return (ERROR);
+    }
+
+    /* Move the completed header into place */
+    if (rename (tmp_file, hdr_file))
+    {
+        sprintf (errmsg, "Renaming %s to %s", tmp_file, hdr_file);
+        error_handler (true, FUNC_NAME, errmsg);
+        unlink (tmp_file);
+        return (ERROR);
+    }
 
     /* Successful completion */
     return (SUCCESS);
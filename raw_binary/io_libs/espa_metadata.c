@@ -17,6 +17,7 @@ NOTES:
   2. This code relies on the libxml2 library developed for the Gnome project.
 *****************************************************************************/
 #include <sys/stat.h>
+#include <unistd.h>
 #include "espa_metadata.h"
 
 /******************************************************************************
@@ -32,6 +33,16 @@ ERROR           XML does not validate against the specified schema
 SUCCESS         XML validates
 
 NOTES:
+  1. The parsed schema and its validation context are kept for the life of
+     the process and reused by later calls which validate against the same
+     schema file/URL, since parsing the schema costs far more than
+     validating a metadata file.  A local schema file is parsed again if
+     its modification time (to the nanosecond, via st_mtim) changes.
+     libxml2 resets the validation context at the start of each
+     xmlSchemaValidateDoc call.
+  2. Since the cached schema depends on the libxml2 global state,
+     xmlCleanupParser should only be called once the application is done
+     with the XML library altogether.
 ******************************************************************************/
 int validate_xml_file
 (
@@ -43,58 +54,151 @@ int validate_xml_file
     char *schema_file = NULL;     /* name of schema file or URL to be validated
                                      against */
     int status;                   /* return status */
+    static bool line_numbers_on = false;  /* have libxml2 line numbers been
+                                             turned on? */
     xmlDocPtr doc = NULL;         /* resulting document tree */
-    xmlSchemaPtr schema = NULL;   /* pointer to the schema */
-    xmlSchemaParserCtxtPtr ctxt = NULL;  /* parser context for the schema */
-    xmlSchemaValidCtxtPtr valid_ctxt = NULL;  /* pointer to validate from the
-                                                 schema */
+    static xmlSchemaPtr schema = NULL;  /* pointer to the schema, cached
+                                           across calls */
+    static char schema_source[STR_SIZE] = "";  /* schema file/URL the cached
+                                                  schema was parsed from */
+    static struct timespec schema_mtime = {0, 0};  /* modification time of
+                                        the cached schema file, 0 for a URL */
+    struct timespec mtime = {0, 0};  /* modification time of the schema
+                                        file */
     struct stat statbuf;          /* buffer for the file stat function */
+    bool local_default = false;   /* is the installed schema being used? */
+    bool cached;                  /* can the cached schema be used? */
+    xmlSchemaParserCtxtPtr ctxt = NULL;  /* parser context for the schema */
+    static xmlSchemaValidCtxtPtr valid_ctxt = NULL;  /* pointer to validate
+                                                 from the schema, cached
+                                                 across calls */
+
+    /* Load the XML file and parse it to the document tree.  This is done
+       before the schema is looked up, so a file which isn't well-formed XML
+       fails without the schema having to be located or parsed.  Line
+       numbers in the error messages are a global libxml2 setting, so they
+       only need to be turned on once, before the first document is read. */
+    if (!line_numbers_on)
+    {
+        xmlLineNumbersDefault (1);
+        line_numbers_on = true;
+    }
+    doc = xmlReadFile (meta_file, NULL, 0);
+    if (doc == NULL)
+    {
+        sprintf (errmsg, "Could not parse %s", meta_file);
+        error_handler (true, FUNC_NAME, errmsg);
+        return (ERROR);
+    }
 
     /* Get the ESPA schema environment variable which specifies the location
-       of the XML schema to be used */
+       of the XML schema to be used.  A single stat tells whether a schema
+       file exists and gives its modification time, which is part of the
+       cache key so a schema file edited in place is parsed again.  A URL
+       fails the stat and keeps a modification time of 0. */
     schema_file = getenv ("ESPA_SCHEMA");
-    if (schema_file == NULL)
+    if (schema_file != NULL)
+    {
+        if (stat (schema_file, &statbuf) == 0)
+            mtime = statbuf.st_mtim;
+    }
+    else
     {  /* ESPA schema environment variable wasn't defined. Try the version in
           /usr/local... */
         schema_file = LOCAL_ESPA_SCHEMA;
-        if (stat (schema_file, &statbuf) == -1)
+        local_default = true;
+        if (stat (schema_file, &statbuf) == 0)
+            mtime = statbuf.st_mtim;
+        else
         {  /* /usr/local ESPA schema file doesn't exist.  Try the version on
               the ESPA http site... */
             schema_file = ESPA_SCHEMA;
+            local_default = false;
         }
     }
 
-    /* Set up the schema parser and parse the schema file/URL */
-    xmlLineNumbersDefault (1);
-    ctxt = xmlSchemaNewParserCtxt (schema_file);
-    xmlSchemaSetParserErrors (ctxt, (xmlSchemaValidityErrorFunc) fprintf,
-        (xmlSchemaValidityWarningFunc) fprintf, stderr);
-    schema = xmlSchemaParse (ctxt);
-
-    /* Free the schema parser context */
-    xmlSchemaFreeParserCtxt (ctxt);
+    /* Use the schema and validation context from a previous call if they
+       were set up from the same, unchanged source */
+    cached = valid_ctxt != NULL && !strcmp (schema_file, schema_source) &&
+        mtime.tv_sec == schema_mtime.tv_sec &&
+        mtime.tv_nsec == schema_mtime.tv_nsec;
 
-    /* Load the XML file and parse it to the document tree */
-    doc = xmlReadFile (meta_file, NULL, 0);
-    if (doc == NULL)
+    /* The installed schema was only checked for existence.  Before parsing
+       it, make sure it can be read, otherwise fall back to the version on
+       the ESPA http site (which may already be the cached schema). */
+    if (!cached && local_default && access (schema_file, R_OK) != 0)
     {
-        sprintf (errmsg, "Could not parse %s", meta_file);
-        error_handler (true, FUNC_NAME, errmsg);
-        sprintf (errmsg, "Possible schema file not found.  ESPA_SCHEMA "
-            "environment variable isn't defined.  The first default schema "
-            "location of %s doesn't exist.  And the second default location of "
-            "%s was used as the last default.", LOCAL_ESPA_SCHEMA, ESPA_SCHEMA);
-        error_handler (true, FUNC_NAME, errmsg);
-        return (ERROR);
+        schema_file = ESPA_SCHEMA;
+        mtime.tv_sec = 0;
+        mtime.tv_nsec = 0;
+        cached = valid_ctxt != NULL && !strcmp (schema_file, schema_source);
     }
 
-    /* Identify the schema file as the validation source */
-    valid_ctxt = xmlSchemaNewValidCtxt (schema);
-    xmlSchemaSetValidErrors (valid_ctxt, (xmlSchemaValidityErrorFunc) fprintf,
-        (xmlSchemaValidityWarningFunc) fprintf, stderr);
+    /* Set up the schema parser and parse the schema file/URL */
+    if (!cached)
+    {
+        if (valid_ctxt != NULL)
+        {
+            xmlSchemaFreeValidCtxt (valid_ctxt);
+            valid_ctxt = NULL;
+        }
+
+        if (schema != NULL)
+        {
+            xmlSchemaFree (schema);
+            schema = NULL;
+        }
+
+        ctxt = xmlSchemaNewParserCtxt (schema_file);
+        xmlSchemaSetParserErrors (ctxt, (xmlSchemaValidityErrorFunc) fprintf,
+            (xmlSchemaValidityWarningFunc) fprintf, stderr);
+        schema = xmlSchemaParse (ctxt);
+
+        /* Free the schema parser context */
+        xmlSchemaFreeParserCtxt (ctxt);
+
+        /* Without a schema there is nothing to validate against */
+        if (schema == NULL)
+        {
+            sprintf (errmsg, "Could not parse the schema %s", schema_file);
+            error_handler (true, FUNC_NAME, errmsg);
+            sprintf (errmsg, "Possible schema file not found.  ESPA_SCHEMA "
+                "environment variable isn't defined.  The first default "
+                "schema location of %s doesn't exist.  And the second default "
+                "location of %s was used as the last default.",
+                LOCAL_ESPA_SCHEMA, ESPA_SCHEMA);
+            error_handler (true, FUNC_NAME, errmsg);
+            xmlFreeDoc (doc);
+            return (ERROR);
+        }
+
+        /* Identify the schema file as the validation source */
+        valid_ctxt = xmlSchemaNewValidCtxt (schema);
+        if (valid_ctxt == NULL)
+        {
+            sprintf (errmsg, "Could not create the validation context for "
+                "the schema %s", schema_file);
+            error_handler (true, FUNC_NAME, errmsg);
+            xmlFreeDoc (doc);
+            return (ERROR);
+        }
+        xmlSchemaSetValidErrors (valid_ctxt,
+            (xmlSchemaValidityErrorFunc) fprintf,
+            (xmlSchemaValidityWarningFunc) fprintf, stderr);
+
+        /* Remember where the schema came from */
+        snprintf (schema_source, sizeof (schema_source), "%s", schema_file);
+        schema_mtime = mtime;
+    }
 
     /* Validate the XML metadata against the schema */
     status = xmlSchemaValidateDoc (valid_ctxt, doc);
+
+    /* Free the document, whether or not it validated.  The schema and its
+       validation context are kept for the next call, so the schema types and
+       the XML library itself aren't cleaned up here. */
+    xmlFreeDoc (doc);
+
     if (status > 0)
     {
         sprintf (errmsg, "%s fails to validate", meta_file);
@@ -109,15 +213,6 @@ int validate_xml_file
         return (ERROR);
     }
 
-    /* Free the resources and clean up the memory */
-    xmlSchemaFreeValidCtxt (valid_ctxt);
-    xmlFreeDoc (doc);
-    if (schema != NULL)
-        xmlSchemaFree (schema);
-    xmlSchemaCleanupTypes();
-    xmlCleanupParser();   /* cleanup the XML library */
-    xmlMemoryDump();      /* for debugging */
-
     /* Successful completion */
     return (SUCCESS);
 }
@@ -553,7 +553,7 @@ int add_global_metadata_proj_info
 
     /* Set up the current and child pointers */
     cur_node = a_node;
-    ns = cur_node->nsDef;
+    ns = cur_node->ns;
     child_node = cur_node->children;
 
     /* Verify the namespace of this node is our ESPA namespace.  If it isn't
@@ -785,7 +785,7 @@ int add_global_metadata_bounding_coords
 
     /* Set up the current and child pointers */
     cur_node = a_node;
-    ns = cur_node->nsDef;
+    ns = cur_node->ns;
     child_node = cur_node->children;
 
     /* Verify the namespace of this node is our ESPA namespace.  If it isn't
@@ -865,7 +865,7 @@ int add_global_metadata
 
     /* Set up the current and child pointers */
     cur_node = a_node;
-    ns = cur_node->nsDef;
+    ns = cur_node->ns;
     child_node = cur_node->children;
 
     /* Verify the namespace of this node is our ESPA namespace.  If it isn't
@@ -1632,7 +1632,7 @@ int add_band_metadata
 
     /* Set up the current and child pointers */
     cur_node = a_node;
-    ns = cur_node->nsDef;
+    ns = cur_node->ns;
 
     /* Verify the namespace of this node is our ESPA namespace.  If it isn't
        then the element won't be added to the metadata structure. */
@@ -2246,16 +2246,6 @@ int parse_xml_into_struct
                 }
             }
 
-            /* Print out the name of the element */
-            xmlAttrPtr attr;     /* pointer to the element attributes */
-
-            /* Print out the attribute properties for this element */
-            for (attr = cur_node->properties; attr != NULL; attr = attr->next)
-            {
-                xmlChar *v = xmlGetProp (cur_node, attr->name);
-                xmlFree (v);
-            }
-
             /* If we are IN the global metadata (don't process the actual
                global_metadata element) then consume this node and add the
                information to the global metadata structure */
@@ -2378,219 +2368,70 @@ int parse_metadata
 {
     char FUNC_NAME[] = "parse_metadata";  /* function name */
     char errmsg[STR_SIZE];        /* error message */
-    xmlTextReaderPtr reader;  /* reader for the XML file */
     xmlDocPtr doc = NULL;     /* document tree pointer */
-    xmlNodePtr current=NULL;  /* pointer to the current node */
-    int status;               /* return status */
-    int nodeType;             /* node type (element, text, attribute, etc.) */
+    xmlNodePtr root = NULL;   /* pointer to the root node */
+    xmlNsPtr ns = NULL;       /* namespace of the root node */
     int top_of_stack;         /* top of the stack */
     int count;                /* number of chars copied in snprintf */
     char **stack = NULL;      /* stack to keep track of elements in the tree */
 
-    /* Establish the reader for this metadata file */
-    reader = xmlNewTextReaderFilename (metafile);
-    if (reader == NULL)
+    /* Parse the XML file directly into a document tree.  The blank text
+       nodes between elements aren't needed for the metadata so they are
+       not kept in the tree. */
+    doc = xmlReadFile (metafile, NULL, XML_PARSE_NOBLANKS);
+    if (doc == NULL)
     {
-        sprintf (errmsg, "Setting up reader for %s", metafile);
+        sprintf (errmsg, "Failed to parse %s", metafile);
         error_handler (true, FUNC_NAME, errmsg);
         return (ERROR);
     }
 
-    /* Use the reader to parse the XML file, looking at each of the nodes,
-       until the entire file has been parsed.  Start by reading the first
-       node in the file. */
-    status = xmlTextReaderRead (reader);
-    while (status == 1)
+    /* Store the namespace of the root element for the overall metadata
+       file.  This is the element's own namespace, not whichever namespace
+       happens to be declared first on it (e.g. xmlns:xsi). */
+    root = xmlDocGetRootElement (doc);
+    if (root == NULL || (ns = root->ns) == NULL)
     {
-        /* Determine what kind of node the reader is at (element, end element,
-           attribute, text/white space) and handle the information as desired */
-        nodeType = xmlTextReaderNodeType (reader);
-        if (nodeType == -1)
-        {
-            sprintf (errmsg, "Getting node type");
-            error_handler (true, FUNC_NAME, errmsg);
-            return (ERROR);
-        }
-        switch (nodeType)
-        {
-            case XML_READER_TYPE_ELEMENT:
-            {  /* Node is an element (ex. <global_metadata>) */
-                xmlNodePtr node=NULL;
-                if (doc==NULL)
-                {
-                    doc=xmlNewDoc (BAD_CAST "1.0");
-                }
-
-                /* Get the URI defining the namespace for this node */
-                if (xmlTextReaderConstNamespaceUri (reader) != NULL)
-                {
-                    /* Search the namespace for a document */
-                    xmlNsPtr ns = xmlSearchNs (doc, current,
-                        xmlTextReaderConstNamespaceUri(reader));
-
-                    /* Create a tree node for this element in the XML file
-                       using the element name */
-                    node = xmlNewNode (ns, xmlTextReaderConstName(reader));
-
-                    /* If the namespace is empty (i.e. root) then create a
-                       new namespace pointer with this node */
-                    if (ns == NULL)
-                    {
-                        ns = xmlNewNs (node,
-                            xmlTextReaderConstNamespaceUri(reader),
-                            xmlTextReaderConstPrefix(reader));
-                    }
-                }
-                else
-                {
-                    /* Create a tree node for this element in the XML file
-                       using the element name */
-                    node = xmlNewNode (0, xmlTextReaderConstName(reader));
-                }
-
-                /* Set the element as the root if appropriate otherwise add
-                   it as a child to the previous element */
-                if (current == NULL)
-                {
-                    xmlDocSetRootElement (doc, node);
-                }
-                else
-                {
-                    xmlAddChild (current, node);
-                }
-                current = node;
-
-                /* If the element has attributes, then handle them */
-                if (xmlTextReaderHasAttributes (reader))
-                {
-                    /* Get the number of attributes and then process each one */
-                    int i;
-                    int n_att = xmlTextReaderAttributeCount (reader);
-                    for (i = 0; i < n_att; i++)
-                    {
-                        /* Read each attribute, obtain the name and value,
-                           then add it as a property for this node in the
-                           tree */
-                        const xmlChar *k = NULL;
-                        xmlChar *v = NULL;
-                        xmlTextReaderMoveToAttributeNo (reader, i);
-                        k = xmlTextReaderConstName (reader);
-                        v = xmlTextReaderValue (reader);
-                        if (xmlTextReaderConstNamespaceUri (reader) != NULL)
-                        {
-                            if (!xmlStrEqual (
-                                xmlTextReaderConstNamespaceUri(reader),
-                                BAD_CAST "http://www.w3.org/2000/xmlns/"))
-                            {
-                                /* Search the namespace for the document */
-                                xmlNsPtr ns = xmlSearchNs (doc, current,
-                                    xmlTextReaderConstNamespaceUri(reader));
-                                if (ns == NULL)
-                                {
-                                    ns = xmlNewNs (node,
-                                        xmlTextReaderConstNamespaceUri(reader),
-                                        xmlTextReaderConstPrefix(reader));
-                                }
-
-                                /* Create a new property tagged with this
-                                   namespace and carried by this node */
-                                xmlNewNsProp (current, ns,
-                                    xmlTextReaderConstLocalName(reader), v);
-                            }
-                         }
-                         else
-                         {
-                            /* Add the attribute as a property of the node
-                               in the tree */
-                            xmlNewProp (current, k, v);
-                         }
-
-                         /* Free the XML value pointer */
-                         xmlFree (v);
-                    }
-
-                    /* We are done with the attributes so go to the current
-                       attribute node */
-                    xmlTextReaderMoveToElement (reader);
-                }
-
-                /* If this is an empty element, then return to the parent */
-                if (xmlTextReaderIsEmptyElement(reader))
-                    current = current->parent;
-                break;
-            }  /* End: Node is an element */
-
-            case XML_READER_TYPE_END_ELEMENT:
-            {  /* Node is an end element (ex. </global_metadata>, so return
-                  to the parent */
-                current = current->parent;
-                break;
-            }
-
-            case XML_READER_TYPE_TEXT:
-            {  /* Node is text or white space */
-                /* Read the value of the text and add it as text for the
-                   node, which is then added as a child to the tree */
-                const xmlChar *v = xmlTextReaderConstValue (reader);
-                xmlNodePtr node = xmlNewDocText (doc, v);
-                xmlAddChild (current, node);
-                break;
-            }
-        }  /* end switch */
-
-        /* Read the next node */
-        status = xmlTextReaderRead (reader);
-    }  /* end while */
-    if (status != 0)
+        sprintf (errmsg, "Root element and namespace not found in %s",
+            metafile);
+        error_handler (true, FUNC_NAME, errmsg);
+        xmlFreeDoc (doc);
+        return (ERROR);
+    }
+    count = snprintf (metadata->meta_namespace,
+        sizeof (metadata->meta_namespace), "%s", (const char *) ns->href);
+    if (count < 0 || count >= sizeof (metadata->meta_namespace))
     {
-        sprintf (errmsg, "Failed to parse %s", metafile);
+        sprintf (errmsg, "Overflow of metadata->meta_namespace string");
         error_handler (true, FUNC_NAME, errmsg);
+        xmlFreeDoc (doc);
         return (ERROR);
     }
 
-    /* If the document tree is not NULL then send in the root node of the
-       tree to be parsed and read into the ESPA metadata structure */
-    if (doc != NULL)
+    /* Initialize the stack to hold the elements */
+    if (init_stack (&top_of_stack, &stack))
     {
-        /* Store the namespace for the overall metadata file */
-        xmlNsPtr ns = xmlDocGetRootElement(doc)->nsDef;
-        count = snprintf (metadata->meta_namespace,
-            sizeof (metadata->meta_namespace), "%s", (const char *) ns->href);
-        if (count < 0 || count >= sizeof (metadata->meta_namespace))
-        {
-            sprintf (errmsg, "Overflow of metadata->meta_namespace string");
-            error_handler (true, FUNC_NAME, errmsg);
-            return (ERROR);
-        }
-
-        /* Initialize the stack to hold the elements */
-        if (init_stack (&top_of_stack, &stack))
-        {
-            sprintf (errmsg, "Initializing the stack.");
-            error_handler (true, FUNC_NAME, errmsg);
-            return (ERROR);
-        }
-        //print_element_names (xmlDocGetRootElement (doc));
-
-        /* Parse the XML document into our ESPA internal metadata structure */
-        if (parse_xml_into_struct (xmlDocGetRootElement(doc), metadata,
-            &top_of_stack, stack))
-        {
-            sprintf (errmsg, "Parsing the metadata file into the internal "
-                "metadata structure.");
-            error_handler (true, FUNC_NAME, errmsg);
-            return (ERROR);
-        }
+        sprintf (errmsg, "Initializing the stack.");
+        error_handler (true, FUNC_NAME, errmsg);
+        xmlFreeDoc (doc);
+        return (ERROR);
+    }
+    //print_element_names (root);
 
-        /* Clean up the XML document and the stack */
+    /* Parse the XML document into our ESPA internal metadata structure */
+    if (parse_xml_into_struct (root, metadata, &top_of_stack, stack))
+    {
+        sprintf (errmsg, "Parsing the metadata file into the internal "
+            "metadata structure.");
+        error_handler (true, FUNC_NAME, errmsg);
         xmlFreeDoc (doc);
         free_stack (&stack);
+        return (ERROR);
     }
 
-    /* Free the reader and associated memory */
-    xmlFreeTextReader (reader);
-    xmlCleanupParser();
-    xmlMemoryDump();
+    /* Clean up the XML document and the stack */
+    xmlFreeDoc (doc);
+    free_stack (&stack);
 
     return (SUCCESS);
 }
@@ -17,7 +17,7 @@ NOTES:
   3. The information on the Sentinel-2 L1C metadata files (MTD_MSIL1C.xml and
      MTD_TL.xml) can be found in the S2_MSI_Product_Specification.pdf file.
 *****************************************************************************/
-#include "dirent.h"
+#include <unistd.h>
 #include "espa_metadata.h"
 #include "parse_sentinel_metadata.h"
 
@@ -25,16 +25,19 @@ NOTES:
 /******************************************************************************
 MODULE:  find_file
 
-PURPOSE: Read the current directory and look for the current file
+PURPOSE: Check the current directory for the current file
 
 RETURN VALUE:
 Type = bool
 Value           Description
 -----           -----------
-false           Error reading the directory and finding the file
+false           File does not exist in the current directory
 true            Filename was successfully found
 
 NOTES:
+1. The file is probed directly with access() rather than reading through the
+   current directory, since this is called for each IMAGE_ID in the product
+   XML until the one for the current tile is found.
 ******************************************************************************/
 bool find_file
 (
@@ -42,41 +45,12 @@ bool find_file
                             extension) */
 )
 {
-    char FUNC_NAME[] = "find_file";  /* function name */
-    char errmsg[STR_SIZE];           /* error message */
     char myfile[STR_SIZE];           /* full filename to search for */
-    bool retval;                     /* value to designate if file was found */
-    DIR *dr = NULL;                  /* ptr to current directory */
-    struct dirent *de = NULL;        /* ptr for directory entry */
 
     /* Add the .jp2 file extension to the filename to determine if it exists */
-    sprintf (myfile, "%s.jp2", basefile);
+    snprintf (myfile, sizeof (myfile), "%s.jp2", basefile);
 
-    /* Open the current directory */
-    dr = opendir(".");
-    if (dr == NULL)
-    {
-        sprintf (errmsg, "Could not open current directory");
-        error_handler (true, FUNC_NAME, errmsg);
-        return (false);
-    }
-
-    /* Loop through the files in the directory */
-    retval = false;
-    while ((de = readdir (dr)) != NULL)
-    {
-        /* Is this the file we are looking for? */
-        if (strstr (de->d_name, myfile))
-        {
-            retval = true;
-            break;
-        }
-    }
-
-    /* Close the directory */
-    closedir (dr);
-
-    return (retval);
+    return (access (myfile, F_OK) == 0);
 }
 
 
@@ -919,8 +893,6 @@ int parse_sentinel_tile_metadata
 
     /* Free the reader and associated memory */
     xmlFreeTextReader (reader);
-    xmlCleanupParser();
-    xmlMemoryDump();
 
     /* The nrows/ncols need to be added to the band metadata for each of the
        bands */
@@ -1008,7 +980,7 @@ int parse_sentinel_product_xml_into_struct
     char *curr_stack_element = NULL;  /* element popped from the stack */
     char *mybounds = NULL;       /* pointer to the string containing the
                                     global position values */
-    char *space = NULL;          /* pointer to blank space */
+    char *endptr = NULL;         /* end of the value parsed by strtod */
     xmlNode *cur_node = NULL;    /* pointer to the current node */
     xmlNode *child_node = NULL;  /* pointer to the child node */
     int count;                   /* number of chars copied in snprintf */
@@ -1270,44 +1242,36 @@ int parse_sentinel_product_xml_into_struct
                    closed polygon provided as a series of vertices (lat, lon)
                    counter-clockwise oriented. The last point is a duplication
                    of the first point in the closed system. */
-                /* Read the first lat/long pair */
-                sscanf ((const char *) child_node->content, "%lf %lf",
-                    &lat1, &lon1);
+                /* Read the first lat/long pair.  strtod returns the end of
+                   each value, so the string is only walked once rather than
+                   searching for the blanks and re-scanning each pair. */
+                mybounds = (char *) child_node->content;
+                lat1 = strtod (mybounds, &endptr);
+                lon1 = strtod (endptr, &endptr);
                 east = west = lon1;
                 north = south = lat1;
 
-                /* Consume the leading spaces in the string before parsing */
-                mybounds = (char *) child_node->content;
-                while (mybounds[0] == ' ')
-                    mybounds++;
-
-                /* Read the next lat/long pairs until they match the first */
+                /* Read the next lat/long pairs until they match the first or
+                   the end of the string is reached */
                 while (true)
                 {
-                    /* Find the next blank space and consume it */
-                    space = strchr (mybounds, ' ');
-                    if (space == NULL)
+                    /* Read the next lat/long pair */
+                    lat = strtod (endptr, &mybounds);
+                    if (mybounds == endptr)
                         break;
-                    mybounds = space + 1;
-
-                    /* Find the second blank space and consume it */
-                    space = strchr (mybounds, ' ');
-                    if (space == NULL)
+                    lon = strtod (mybounds, &endptr);
+                    if (endptr == mybounds)
                         break;
-                    mybounds = space + 1;
-
-                    /* Read the next lat/long pair */
-                    sscanf ((const char *) mybounds, "%lf %lf", &lat, &lon);
 
                     /* Is this the same as the first set? */
                     if (lat1 == lat && lon1 == lon)
                         break;
 
                     /* Check for bounds */
-                    if (lon < west) west = lon;
-                    if (lon > east) east = lon;
-                    if (lat > north) north = lat;
-                    if (lat < south) south = lat;
+                    west = (lon < west) ? lon : west;
+                    east = (lon > east) ? lon : east;
+                    north = (lat > north) ? lat : north;
+                    south = (lat < south) ? lat : south;
                 }
 
                 /* Store the bounding coordinates */
@@ -1621,8 +1585,6 @@ int parse_sentinel_product_metadata
 
     /* Free the reader and associated memory */
     xmlFreeTextReader (reader);
-    xmlCleanupParser();
-    xmlMemoryDump();
 
     return (SUCCESS);
 }
@@ -371,6 +371,7 @@ static int ias_geo_read_polygon
 {
     int id;
     int child_id;
+    double bounds[4];               /* Min X, max X, min Y, max Y */
     IAS_POLYGON_LINKED_LIST *child_tail = NULL;
 
     if (fread(&id, sizeof(int), 1, fp) != 1)
@@ -424,33 +425,17 @@ static int ias_geo_read_polygon
         return ERROR;
     }
 
-    if (fread(&polygon->min_x, sizeof(double), 1, fp) != 1)
+    /* The bounds are stored together, so read them with a single call */
+    if (fread(bounds, sizeof(double), 4, fp) != 4)
     {
-        IAS_LOG_ERROR("Reading minimum X bounds for polygon");
-        ias_geo_free_polygon_linked_list(polygon);
-        return ERROR;
-    }
-
-    if (fread(&polygon->max_x, sizeof(double), 1, fp) != 1)
-    {
-        IAS_LOG_ERROR("Reading maximum X bounds for polygon");
-        ias_geo_free_polygon_linked_list(polygon);
-        return ERROR;
-    }
-
-    if (fread(&polygon->min_y, sizeof(double), 1, fp) != 1)
-    {
-        IAS_LOG_ERROR("Reading minimum Y bounds for polygon");
-        ias_geo_free_polygon_linked_list(polygon);
-        return ERROR;
-    }
-
-    if (fread(&polygon->max_y, sizeof(double), 1, fp) != 1)
-    {
-        IAS_LOG_ERROR("Reading maximum Y bounds for polygon");
+        IAS_LOG_ERROR("Reading X/Y bounds for polygon");
         ias_geo_free_polygon_linked_list(polygon);
         return ERROR;
     }
+    polygon->min_x = bounds[0];
+    polygon->max_x = bounds[1];
+    polygon->min_y = bounds[2];
+    polygon->max_y = bounds[3];
 
     if (fread(&polygon->num_segs, sizeof(unsigned int), 1, fp) !=1 )
     {
@@ -569,6 +554,7 @@ int ias_geo_load_polygon
     int error_occured = FALSE;        /* Error tracking flag */
     IAS_DBL_XY *bb_max;               /* Bounding box max x/y values */
     IAS_DBL_XY *bb_min;               /* Bounding box min x/y values */
+    double bounds[4];                 /* Min X, max X, min Y, max Y */
 
     /* Assume no polygons will be read */
     *head = NULL;
@@ -632,33 +618,18 @@ int ias_geo_load_polygon
             break;
         }
 
-        if (fread(&bb_min[i].x, sizeof(double), 1, fp) != 1)
-        {
-            IAS_LOG_ERROR("Reading minimum X bound");
-            error_occured = TRUE;
-            break;
-        }
-
-        if (fread(&bb_max[i].x, sizeof(double), 1, fp) != 1)
-        {
-            IAS_LOG_ERROR("Reading maximum X bound");
-            error_occured = TRUE;
-            break;
-        }
-
-        if (fread(&bb_min[i].y, sizeof(double), 1, fp) != 1)
-        {
-            IAS_LOG_ERROR("Reading minimum Y bound");
-            error_occured = TRUE;
-            break;
-        }
-
-        if (fread(&bb_max[i].y, sizeof(double), 1, fp) != 1)
+        /* The bounds are stored together, so read them with a single
+           call */
+        if (fread(bounds, sizeof(double), 4, fp) != 4)
         {
-            IAS_LOG_ERROR("Reading maximum Y bound");
+            IAS_LOG_ERROR("Reading X/Y bounds");
             error_occured = TRUE;
             break;
         }
+        bb_min[i].x = bounds[0];
+        bb_max[i].x = bounds[1];
+        bb_min[i].y = bounds[2];
+        bb_max[i].y = bounds[3];
     }
 
     /* Check for errors while reading the parent bounding boxes
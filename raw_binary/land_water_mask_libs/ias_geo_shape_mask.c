@@ -109,7 +109,10 @@ int ias_geo_shape_mask
     unsigned int index;         /* Generic counter */
     double delta_latitude;      /* Delta latitude */
     double delta_longitude;     /* Delta longitude */
+    double polygon_min_lat;     /* Minimum latitude of the polygons */
+    double polygon_max_lat;     /* Maximum latitude of the polygons */
     IAS_POLYGON_LINKED_LIST *polygon_list; /* Polygon linked list pointer */
+    IAS_POLYGON_LINKED_LIST *polygon;      /* Polygon loop pointer */
     FILE *fp;                   /* Polygon file pointer */
 
     /* Open the polygon file. */
@@ -154,14 +157,38 @@ int ias_geo_shape_mask
             / num_samples;
     }
 
-    /* Loop through each line */
-    for (line = 0, index = 0; line < num_lines; line++)
+    /* Find the latitude range covered by the polygons.  Children lie within
+       their parents, so the top-level polygons are enough.  With no
+       polygons the range stays empty and every line is skipped. */
+    polygon_min_lat = 90.0;
+    polygon_max_lat = -90.0;
+    for (polygon = polygon_list; polygon; polygon = polygon->next)
+    {
+        if (polygon->min_y < polygon_min_lat)
+            polygon_min_lat = polygon->min_y;
+        if (polygon->max_y > polygon_max_lat)
+            polygon_max_lat = polygon->max_y;
+    }
+
+    /* Loop through each line.  Lines are independent of each other, so they
+       are split across threads when threading is enabled. */
+#ifdef _OPENMP
+    #pragma omp parallel for private (index) schedule (dynamic)
+#endif
+    for (line = 0; line < num_lines; line++)
     {
         unsigned int sample;        /* Sample counter */
         double latitude;            /* Latitude */
 
         latitude = upper_left_lat - delta_latitude * line;
 
+        /* Lines outside the latitude range of every polygon bounding box
+           can't be inside a polygon and stay zero in the mask */
+        if (latitude < polygon_min_lat || latitude > polygon_max_lat)
+            continue;
+
+        index = line * num_samples;
+
         /* Loop through each sample */
         for (sample = 0; sample < num_samples; sample++, index++)
         {           
@@ -173,11 +200,10 @@ int ias_geo_shape_mask
 
             longitude = upper_left_long + delta_longitude * sample;
 
-            /* Adjust for 180 crossing. */
-            if (longitude >= 180)
-            {
-                longitude -= 360;
-            }
+            /* Adjust for 180 crossing.  The sweep never exceeds one
+               wrap, so a single conditional subtraction is enough and is
+               written without a branch. */
+            longitude -= 360 * (longitude >= 180);
 
             /* Initialize the flag and distances */
             inside_flag = 0;
@@ -199,6 +225,11 @@ int ias_geo_shape_mask
                     unsigned int bit;   /* Bit-level indexing */
                     byte = index / 8;
                     bit = 7 - index % 8;
+
+                    /* Neighboring lines can share a byte of the mask */
+#ifdef _OPENMP
+                    #pragma omp atomic
+#endif
                     mask[byte] |= 1 << bit;
                 }
     
@@ -247,6 +278,9 @@ int ias_geo_shape_mask_projection
 {
     IAS_DBL_LAT_LONG corners[4];    /* Lat/Long corners: UL, UR, LL, LR */
     const IAS_CORNERS *corners_ptr; /* Image corners  */
+    const IAS_DBL_XY *image_corners[4]; /* Image corners: UL, UR, LL, LR */
+    static const char *corner_names[4] = {"upper left", "upper right",
+        "lower left", "lower right"};  /* Corner names for error messages */
     double lng[4];                  /* Corner longitudes */
     unsigned int min_lat = 0;       /* Minimum latitude */
     unsigned int max_lat = 0;       /* Maximum latitude */
@@ -295,45 +329,23 @@ int ias_geo_shape_mask_projection
         return ERROR;
     }
 
-    /* Convert the corner coordinates to lat/long. */
-    if (ias_geo_transform_coordinate(geographic_transformation, 
-            corners_ptr->upleft.x, corners_ptr->upleft.y, &corners[0].lng, 
-            &corners[0].lat) != SUCCESS)
-    {
-        IAS_LOG_ERROR("Error converting upper left projection parameters to "
-                "lat/long.");
-        ias_geo_destroy_proj_transformation(geographic_transformation);
-        return ERROR;
-    }
-
-    if (ias_geo_transform_coordinate(geographic_transformation, 
-            corners_ptr->upright.x, corners_ptr->upright.y, &corners[1].lng, 
-            &corners[1].lat) != SUCCESS)
-    {
-        IAS_LOG_ERROR("Error converting upper right projection parameters to "
-                "lat/long.");
-        ias_geo_destroy_proj_transformation(geographic_transformation);
-        return ERROR;
-    }
-
-    if (ias_geo_transform_coordinate(geographic_transformation,
-            corners_ptr->loleft.x, corners_ptr->loleft.y, &corners[2].lng, 
-            &corners[2].lat) != SUCCESS)
-    {
-        IAS_LOG_ERROR("Error converting lower left projection parameters to "
-                "lat/long.");
-        ias_geo_destroy_proj_transformation(geographic_transformation);
-        return ERROR;
-    }
-
-    if (ias_geo_transform_coordinate(geographic_transformation, 
-            corners_ptr->loright.x, corners_ptr->loright.y, &corners[3].lng, 
-            &corners[3].lat) != SUCCESS)
+    /* Convert the corner coordinates to lat/long in a single pass over the
+       UL, UR, LL, LR corners. */
+    image_corners[0] = &corners_ptr->upleft;
+    image_corners[1] = &corners_ptr->upright;
+    image_corners[2] = &corners_ptr->loleft;
+    image_corners[3] = &corners_ptr->loright;
+    for (index = 0; index < 4; index++)
     {
-        IAS_LOG_ERROR("Error converting lower right projection parameters to "
-                "lat/long.");
-        ias_geo_destroy_proj_transformation(geographic_transformation);
-        return ERROR;
+        if (ias_geo_transform_coordinate(geographic_transformation, 
+                image_corners[index]->x, image_corners[index]->y,
+                &corners[index].lng, &corners[index].lat) != SUCCESS)
+        {
+            IAS_LOG_ERROR("Error converting %s projection parameters to "
+                    "lat/long.", corner_names[index]);
+            ias_geo_destroy_proj_transformation(geographic_transformation);
+            return ERROR;
+        }
     }
 
     /* Check whether we are crossing the dateline.  Adjust the corner
@@ -405,6 +417,8 @@ int ias_geo_shape_mask_projection
     for (vgrid = 0; vgrid <= num_vert_grids; vgrid++)
     {
         int grid_lines = GRID_SIZE_VERT; /* Number of lines in grid */
+        IAS_DBL_LS right_pixel[2];       /* Translated UR LR of last grid */
+        int right_status[2];             /* In-mask status of UR LR */
 
         /* If it is the end of the image determine smaller grid */
         if (vgrid == num_vert_grids)
@@ -420,6 +434,7 @@ int ias_geo_shape_mask_projection
         {
             IAS_DBL_LS translated_pixel[4];     /* Translated  line/samp */ 
             IAS_DBL_XY grid_corners[4];         /* UL LL UR LR */
+            int corner_status[4];               /* In-mask status of corners */
             int grid_value = -1;                /* Grid match value */
             int bad_grid = 0;                   /* Boolean for bad grid check */
             int grid_samples = GRID_SIZE_HORZ;  /* Number of samples in grid */
@@ -445,23 +460,34 @@ int ias_geo_shape_mask_projection
             grid_corners[1].x = grid_corners[0].x;
 
             grid_corners[2].y = grid_corners[0].y;
-            grid_corners[2].x = grid_corners[0].x + (grid_samples
-                * image->pixel_size_x);
+            grid_corners[2].x = ((GRID_SIZE_HORZ * hgrid + grid_samples)
+                * image->pixel_size_x) + corners_ptr->upleft.x;
 
             grid_corners[3].y = grid_corners[1].y;
             grid_corners[3].x = grid_corners[2].x;
             
-            /* Transform the grid corners to bit mask line/sample */
+            /* Transform the grid corners to bit mask line/sample.  The left
+               corners of a grid are the right corners of the previous grid
+               in the row, so reuse those instead of transforming them
+               again. */
             for (index = 0; index < 4; index ++)
             {
-                int status; /* Status placeholder */
+                if (hgrid > 0 && index < 2)
+                {
+                    translated_pixel[index] = right_pixel[index];
+                    corner_status[index] = right_status[index];
+                }
+                else
+                {
+                    corner_status[index] =
+                        convert_target_xy_to_input_line_sample(
+                        &grid_corners[index], geographic_transformation, 
+                        lng[min_lng], corners[max_lat].lat, 
+                        delta_longitude, delta_latitude, num_samples, 
+                        num_lines, &translated_pixel[index]);
+                }
 
-                status = convert_target_xy_to_input_line_sample(
-                    &grid_corners[index], geographic_transformation, 
-                    lng[min_lng], corners[max_lat].lat, 
-                    delta_longitude, delta_latitude, num_samples, 
-                    num_lines, &translated_pixel[index]);
-                if (status == ERROR)
+                if (corner_status[index] == ERROR)
                 {
                     IAS_LOG_ERROR("Translating grid corners for grid line %d"
                         " sample %d ", vgrid * GRID_SIZE_VERT, hgrid 
@@ -471,12 +497,18 @@ int ias_geo_shape_mask_projection
                         geographic_transformation);
                     return ERROR;
                 }
-                else if (!status)
+                else if (!corner_status[index])
                 {
                     bad_grid = 1;
                 }
             }
 
+            /* Save the right corners for the next grid in the row */
+            right_pixel[0] = translated_pixel[2];
+            right_pixel[1] = translated_pixel[3];
+            right_status[0] = corner_status[2];
+            right_status[1] = corner_status[3];
+
             /* If all corners are in bit_mask check bit_mask grid */
             if (!bad_grid)
             {
@@ -5,6 +5,57 @@
 #include "ias_math.h"
 #include "ias_const.h"
 
+/*****************************************************************************
+NAME:  count_crossings
+
+PURPOSE: Determine the parity of the number of polygon sides between
+         first_point and last_point crossed by a ray cast from the point in
+         the +y direction.
+
+RETURN VALUE:
+Type = int
+Value    Description
+-----    -----------
+1           Odd number of crossings
+0           Even number of crossings
+
+Notes:  The crossing test is accumulated with an exclusive-or instead of a
+        conditional toggle so the loop carries no branches and the compiler
+        is free to vectorize it.  The intersection is computed for every
+        side, but it only contributes when the side straddles point_x, so
+        the division by zero for vertical sides never affects the result.
+
+*****************************************************************************/
+static int count_crossings
+(
+    unsigned int first_point,   /* I: First vertex of the sides to check */
+    unsigned int last_point,    /* I: Last vertex of the sides to check */
+    const double *vert_x,       /* I: Vertices of polygon */
+    const double *vert_y,       /* I: Vertices of polygon */
+    double point_x,             /* I: X coordinate of point */
+    double point_y              /* I: Y coordinate of point */
+)
+{
+    unsigned int point;         /* Point loop counter */
+    int straddles;              /* Side spans point_x */
+    int below;                  /* Point is below the side */
+    int crossings = 0;          /* Parity of the number of crossings */
+
+    for (point = first_point; point < last_point; point++)
+    {
+        double x1 = vert_x[point];
+        double x2 = vert_x[point + 1];
+        double y1 = vert_y[point];
+        double y2 = vert_y[point + 1];
+
+        straddles = (x1 > point_x) != (x2 > point_x);
+        below = point_y < (y2 - y1) * (point_x - x1) / (x2 - x1) + y1;
+        crossings ^= straddles & below;
+    }
+
+    return crossings;
+}
+
 /*****************************************************************************
 NAME:  ias_math_point_in_closed_polygon
 
@@ -40,7 +91,6 @@ int ias_math_point_in_closed_polygon
     const IAS_POLYGON_SEGMENT *poly_seg /* I: Array of polygon segments */
 )
 {
-    unsigned int point;         /* Point loop counter */
     unsigned int segment;       /* Segment loop counter */
     int intflag = 0;            /* Flag denoting even (0) or odd (1) 
                                     number of polygon side intersections */
@@ -63,32 +113,16 @@ int ias_math_point_in_closed_polygon
             }
             /* Loop through the points in this segment checking the
                number of intersections */
-            for (point = poly_seg[segment].first_point; 
-                 point < poly_seg[segment].last_point; point++)
-            {
-                if (((vert_x[point] > point_x) != (vert_x[point + 1] > point_x))
-                    && (point_y < (vert_y[point + 1] - vert_y[point]) 
-                    * (point_x - vert_x[point]) / (vert_x[point + 1] 
-                    - vert_x[point]) + vert_y[point]))
-                {
-                    intflag = !intflag;
-                }
-            }
+            intflag ^= count_crossings(poly_seg[segment].first_point,
+                poly_seg[segment].last_point, vert_x, vert_y, point_x,
+                point_y);
         }
     }
     else
     {
         /* Loop through the points checking the number of intersections */
-        for (point = 0; point < num_sides; point++)
-        {
-            if (((vert_x[point] > point_x) != (vert_x[point + 1] > point_x))
-                && (point_y < (vert_y[point + 1] - vert_y[point]) * (point_x
-                - vert_x[point]) / (vert_x[point + 1] - vert_x[point])
-                + vert_y[point]))
-            {
-                intflag = !intflag;
-            }
-        }
+        intflag = count_crossings(0, num_sides, vert_x, vert_y, point_x,
+            point_y);
     }
 
     /* If the number of intersections is even, the point is outside the
@@ -1,15 +1,18 @@
-#! /usr/bin/env python
+#! /usr/bin/env python3
 import sys
 import os
 import shutil
-import glob
-from optparse import OptionParser
+import tempfile
 from zipfile import ZipFile
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
 ERROR = 1
 SUCCESS = 0
 
+# module logger, looked up once rather than on every call
+logger = logging.getLogger(__name__)
+
 
 #############################################################################
 # Created on August 23, 2019 by Gail Schmidt, USGS/EROS
@@ -20,7 +23,7 @@ SUCCESS = 0
 #
 # Usage: unpackage_s2.py --help prints the help message
 ############################################################################
-class S2SAFE():
+class S2SAFE:
 
     def __init__(self):
         pass
@@ -29,7 +32,7 @@ class S2SAFE():
     ########################################################################
     # Description: unpackage will unzip the specified Sentinel-2 .zip file
     # into the specified directory.  From there, the image products and
-    # required JPEG2000 files will be copied to the top directory.  All the
+    # required JPEG2000 files will be moved to the top directory.  All the
     # other files and subdirectories will be removed.
     #
     # Inputs:
@@ -48,63 +51,93 @@ class S2SAFE():
     def unpackage (self, infile=None, outdir=None):
         # if no parameters were passed then get the info from the
         # command line
-        if infile == None:
-            # get the command line argument for the input file
-            parser = OptionParser()
-            parser.add_option ("-i", "--infile",
-                               type="string", dest="infile",
-                               help="name of input Sentinel-2 .zip file",
-                               metavar="FILE")
-            parser.add_option ("-o", "--outdir",
-                               type="string", dest="outdir",
-                               help="name of output directory into which the "
-                                    "Sentinel-2 product will be unzipped",
-                               metavar="DIR")
-            (options, args) = parser.parse_args()
+        if infile is None:
+            # get the command line argument for the input file. argparse is
+            # only imported here since it isn't needed when called with
+            # parameters.
+            from argparse import ArgumentParser
+            parser = ArgumentParser()
+            parser.add_argument ("-i", "--infile", dest="infile",
+                                 help="name of input Sentinel-2 .zip file",
+                                 metavar="FILE")
+            parser.add_argument ("-o", "--outdir", dest="outdir",
+                                 help="name of output directory into which "
+                                      "the Sentinel-2 product will be "
+                                      "unzipped",
+                                 metavar="DIR")
+            args = parser.parse_args()
     
             # S2 input file
-            infile = options.infile
-            if infile == None:
+            infile = args.infile
+            if infile is None:
                 parser.error ('missing S2 input file command-line argument');
                 return ERROR
 
             # S2 output directory
-            outdir = options.outdir
-            if outdir == None:
+            outdir = args.outdir
+            if outdir is None:
                 parser.error ('missing S2 output directory command-line '
                               'argument');
                 return ERROR
 
-        # get the logger
-        logger = logging.getLogger(__name__)
-        msg = ('Unpackaging Sentinel-2 package {} into {}'
-               .format(infile, outdir))
-        logger.info(msg)
+        logger.info('Unpackaging Sentinel-2 package %s into %s', infile,
+                    outdir)
         
         # make sure the input file exists
         if not os.path.isfile(infile):
-            msg = ('Input Sentinel-2 package does not exist or is not '
-                   'accessible: {}'.format(infile))
-            logger.error(msg)
+            logger.error('Input Sentinel-2 package does not exist or is not '
+                         'accessible: %s', infile)
             return ERROR
 
         # make sure the output directory exists otherwise create it. if it
-        # exists, make sure it is writable.
-        if not os.path.exists(outdir):
-            msg = ('Making directory {}'.format(outdir))
-            logger.error(msg)
+        # exists, make sure it is writable. try the mkdir directly rather
+        # than checking for existence first.
+        try:
             os.mkdir(outdir)
-        else:
+            logger.info('Made directory %s', outdir)
+        except FileExistsError:
             if not os.access(outdir, os.W_OK):
-                msg = ('Path of output directory is not writable: {}. Script '
-                       'needs write access to this directory.'.format(outdir))
-                logger.error(msg)
+                logger.error('Path of output directory is not writable: %s. '
+                             'Script needs write access to this directory.',
+                             outdir)
                 return ERROR
+        except OSError as e:
+            logger.error('Unable to create output directory %s: %s', outdir,
+                         e)
+            return ERROR
+
+        # unzip into a scratch directory under the output directory. only
+        # the files that are needed are moved out of it, so all the
+        # intermediate files are removed with a single rmtree at the end,
+        # even if the unpackaging fails part way through.
+        workdir = tempfile.mkdtemp(prefix='.unpackage_s2_', dir=outdir)
+        try:
+            return self.extract(infile, outdir, workdir)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
 
-        zipfile = os.path.basename(infile)
 
+    ########################################################################
+    # Description: extract will unzip the specified Sentinel-2 .zip file
+    # into the scratch directory and move the image products and required
+    # JPEG2000 files from there into the .SAFE directory under the output
+    # directory.
+    #
+    # Inputs:
+    #   infile - name of input Sentinel-2 .zip file
+    #   outdir - name of output directory
+    #   workdir - name of the scratch directory into which to unzip the
+    #             Sentinel-2 product
+    #
+    # Returns:
+    #     ERROR - error unpackaging the Sentinel-2 product
+    #     SUCCESS - successful unpackage
+    #
+    # Notes:
+    #   1. Everything left behind in workdir is removed by the caller.
+    #######################################################################
+    def extract (self, infile, outdir, workdir):
         # get the top-level directory from the .zip file
-        safe_dirname = None
         inspire_xmlname = None
         with ZipFile(infile, 'r') as zip:
             listOfFileNames = zip.namelist()
@@ -127,75 +160,100 @@ class S2SAFE():
         # save the top-level directory as the .SAFE directory
         safe_dirname = inspire_xmlname.split(os.sep)[0]
 
-        # unzip the file into the output directory
+        # unzip the file into the output directory. the first file in each
+        # directory is extracted serially, which creates all the
+        # directories. the rest (mostly the JPEG2000 bands) are then
+        # extracted in parallel, since decompressing and writing them
+        # releases the GIL and the threads never race to create the same
+        # directory.
         with ZipFile(infile, 'r') as zip:
-            # extract all the files
-            zip.extractall(path=outdir)
-
-        # change directories to the Sentinel-2 output directory. the Sentinel-2
-        # SAFE directory is the same as the .zip file with .zip replaced by
-        # .SAFE.
-        s2dir = '{}/{}'.format(outdir, safe_dirname)
-        mydir = os.getcwd()
-        msg = ('Changing directories to: {}'.format(s2dir))
-        logger.info(msg)
-        os.chdir(s2dir)
-
-        # make a temp directory to save the desired files
-        espa_temp = 'ESPATEMP'
-        os.mkdir(espa_temp)
-
-        # copy the MTD_MSIL1C.xml file into the temp directory. If it doesn't
-        # exist, then this is the old S2 format and we need to look for
-        # a file with S2[A|B]_OPER_MTD_*.xml.
-        mtd_xmlname = 'MTD_MSIL1C.xml'
+            first_members = []
+            other_members = []
+            dirnames = set()
+            for member in zip.infolist():
+                dirname = os.path.dirname(member.filename)
+                if dirname in dirnames:
+                    other_members.append(member)
+                else:
+                    dirnames.add(dirname)
+                    first_members.append(member)
+
+            zip.extractall(path=workdir, members=first_members)
+            with ThreadPoolExecutor() as executor:
+                # consume the results so any extraction error is raised here
+                list(executor.map(
+                    lambda member: zip.extract(member, path=workdir),
+                    other_members))
+
+        # the Sentinel-2 SAFE directory is the same as the .zip file with
+        # .zip replaced by .SAFE. all paths below are built relative to it
+        # rather than changing the working directory of the process. the
+        # unzipped directory is in the scratch directory, and the desired
+        # files are moved from there into the same directory under outdir.
+        safedir = os.path.join(workdir, safe_dirname)
+        s2dir = os.path.join(outdir, safe_dirname)
+        logger.info('Processing Sentinel-2 directory: %s', s2dir)
+        os.makedirs(s2dir, exist_ok=True)
+
+        # move the MTD_MSIL1C.xml file. If it doesn't exist, then this is the
+        # old S2 format and we need to look for a file with
+        # S2[A|B]_OPER_MTD_*.xml.
+        mtd_xmlname = os.path.join(s2dir, 'MTD_MSIL1C.xml')
+        src_xmlname = os.path.join(safedir, 'MTD_MSIL1C.xml')
         old_s2_format = False
-        if not os.path.isfile(mtd_xmlname):
+        if not os.path.isfile(src_xmlname):
             msg = 'Processing older Sentinel-2 package...'
             logger.info(msg)
 
-            # find the MTD XML name
-            xmlfiles = glob.glob('*.xml')
+            # find the MTD XML name. the names are matched directly from the
+            # directory listing rather than through glob.
             found = False
-            for xmlname in xmlfiles:
-                if (xmlname.find('OPER_MTD_') != -1):
+            for xmlname in os.listdir(safedir):
+                if (xmlname.endswith('.xml') and
+                        xmlname.find('OPER_MTD_') != -1):
                     # found the desired XML file
-                    os.rename(xmlname, mtd_xmlname)
+                    src_xmlname = os.path.join(safedir, xmlname)
                     found = True
                     old_s2_format = True
                     break
 
             # make sure the MTD XML file was found
             if not found:
-                msg = ('Top-level XML file was not found.  Looking for '
-                       '{} or something similar to S2[A|B]_OPER_MTD_*.xml.'
-                       .format(mtd_xmlname))
-                logger.error(msg)
+                logger.error('Top-level XML file was not found.  Looking for '
+                             '%s or something similar to '
+                             'S2[A|B]_OPER_MTD_*.xml.', mtd_xmlname)
                 return ERROR
 
-        # copy the product XML file to the ESPA temporary dir
-        shutil.copy(mtd_xmlname, espa_temp)
+        os.replace(src_xmlname, mtd_xmlname)
 
-        # determine the name of the {product_id} directory under GRANULE
-        granule_dir = 'GRANULE'
+        # determine the name of the {product_id} directory under GRANULE.
+        # the directory entries already know their type, so no stat is
+        # needed per entry.
+        granule_dir = os.path.join(safedir, 'GRANULE')
         found = False
-        gran_dirs = glob.glob('{}/*'.format(granule_dir))
-        for tmpdir in gran_dirs:
-            # only look at the directories
-            if os.path.isdir(tmpdir):
-                # old S2 - looking for directories with S2[A|B]_OPER_MSI_L1C_TL*
-                if old_s2_format and (tmpdir.find('OPER_MSI_L1C_TL') != -1):
-                    # found desired directory
-                    prodid_dir = tmpdir
-                    found = True
-                    break
-
-                # new S2 - looking for directories with L1C_*
-                elif not old_s2_format and (tmpdir.find('L1C_') != -1):
-                    # found desired directory
-                    prodid_dir = tmpdir
-                    found = True
-                    break
+        with os.scandir(granule_dir) as entries:
+            for entry in entries:
+                # only look at the directories
+                dirname = entry.name
+                tmpdir = entry.path
+                if entry.is_dir():
+
+                    # old S2 - looking for directories with
+                    # S2[A|B]_OPER_MSI_L1C_TL*
+                    if (old_s2_format and
+                            dirname.find('OPER_MSI_L1C_TL') != -1):
+                        # found desired directory
+                        prodid_dir = tmpdir
+                        found = True
+                        break
+
+                    # new S2 - looking for directories with L1C_*
+                    elif (not old_s2_format and
+                            dirname.find('L1C_') != -1):
+                        # found desired directory
+                        prodid_dir = tmpdir
+                        found = True
+                        break
 
         # make sure the product_id directory was found
         if not found:
@@ -205,75 +263,73 @@ class S2SAFE():
             logger.error(msg)
             return ERROR
 
-        # copy the MTD_TL.xml file from GRANULE/{product_id} into the temp
-        # directory.  If this is the old Sentinel format, then we need to look
-        # for a file with S2[A|B]_OPER_MTD_L1C_TL*.xml.
+        # move the MTD_TL.xml file from GRANULE/{product_id} into the
+        # output .SAFE directory.  If this is the old Sentinel format, then we
+        # need to look for a file with S2[A|B]_OPER_MTD_L1C_TL*.xml.
         tile_xmlname = 'MTD_TL.xml'
         if old_s2_format:
             # find the MTD XML name
-            xmlfiles = glob.glob('{}/*.xml'.format(prodid_dir))
             found = False
-            for xmlname in xmlfiles:
-                if (xmlname.find('OPER_MTD_L1C_TL') != -1):
+            for xmlname in os.listdir(prodid_dir):
+                if (xmlname.endswith('.xml') and
+                        xmlname.find('OPER_MTD_L1C_TL') != -1):
                     # found the desired XML file
-                    tile_xmlname = '{}/{}'.format(granule_dir, tile_xmlname)
-                    os.rename(xmlname, tile_xmlname)
+                    src_xmlname = os.path.join(prodid_dir, xmlname)
                     found = True
                     break
 
             # make sure the MTD XML file was found
             if not found:
-                msg = ('Tile-level XML file was not found.  Looking for {} '
-                       'or something similar to S2[A|B]_OPER_MTD_L1C_TL*.xml.'
-                       .format(tile_xmlname))
-                logger.error(msg)
+                logger.error('Tile-level XML file was not found.  Looking '
+                             'for %s or something similar to '
+                             'S2[A|B]_OPER_MTD_L1C_TL*.xml.', tile_xmlname)
                 return ERROR
 
         else:
-            tile_xmlname = '{}/{}'.format(prodid_dir, tile_xmlname)
-
-        # copy the tile XML file to the ESPA temporary dir
-        shutil.copy(tile_xmlname, espa_temp)
-
-        # copy the JPEG2000 image files from GRANULE/{product_id}/IMG_DATA
-        # into the temp directory
-        imgdir = '{}/IMG_DATA'.format(prodid_dir)
-        jp2files = glob.glob('{}/*.jp2'.format(imgdir))
-        for jp2 in jp2files:
-            shutil.copy(jp2, espa_temp)
-
-        # cleanup all the directories and files except the temp directory
-        filelist = glob.glob('*')
-        for myfile in filelist:
-            if myfile != espa_temp:
-                # remove this file or directory (and all contents)
-                if os.path.isdir(myfile):
-                    shutil.rmtree(myfile)
-                elif os.path.isfile(myfile):
-                    os.remove(myfile)
-
-        # move the contents of the temp directory to the top level directory
-        filelist = glob.glob('{}/*'.format(espa_temp))
-        for myfile in filelist:
-            shutil.copy(myfile, os.getcwd())
-
-        # remove the temp directory
-        shutil.rmtree(espa_temp)
-
-        # successful completion.  return to the original directory.
-        os.chdir (mydir)
-        msg = 'Completion of Sentinel-2 unpackaging into: {}'.format(s2dir)
-        logger.info(msg)
+            src_xmlname = os.path.join(prodid_dir, tile_xmlname)
+
+        os.replace(src_xmlname, os.path.join(s2dir, tile_xmlname))
+
+        # move the JPEG2000 image files from GRANULE/{product_id}/IMG_DATA
+        # into the output .SAFE directory
+        imgdir = os.path.join(prodid_dir, 'IMG_DATA')
+        for jp2 in os.listdir(imgdir):
+            if jp2.endswith('.jp2'):
+                os.replace(os.path.join(imgdir, jp2), os.path.join(s2dir, jp2))
+
+        # successful completion
+        logger.info('Completion of Sentinel-2 unpackaging into: %s', s2dir)
         return SUCCESS
 
 ######end of S2SAFE class######
 
 if __name__ == "__main__":
-    # setup the default logger format and level. log to STDOUT.
-    logging.basicConfig(format=('%(asctime)s.%(msecs)03d %(process)d'
-                                ' %(levelname)-8s'
-                                ' %(filename)s:%(lineno)d:'
-                                '%(funcName)s -- %(message)s'),
-                        datefmt='%Y-%m-%d %H:%M:%S',
-                        level=logging.INFO)
+    # the handlers module is only needed when run as a script
+    import logging.handlers
+
+    # this is a single-process script that only logs from the main thread,
+    # so don't collect thread and process information for every record.
+    # the process ID is fixed for the life of the script and is written
+    # into the format once.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    # setup the default logger format and level. log to STDOUT. records
+    # are batched in a memory handler and written out together; errors are
+    # flushed right away and anything left over is flushed at exit by
+    # logging.shutdown.
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(
+        fmt=('%(asctime)s.%(msecs)03d ' + str(os.getpid()) +
+             ' %(levelname)-8s'
+             ' %(filename)s:%(lineno)d:'
+             '%(funcName)s -- %(message)s'),
+        datefmt='%Y-%m-%d %H:%M:%S'))
+    mem_handler = logging.handlers.MemoryHandler(256,
+                                                 flushLevel=logging.ERROR,
+                                                 target=handler)
+    root_logger = logging.getLogger()
+    root_logger.addHandler(mem_handler)
+    root_logger.setLevel(logging.INFO)
     sys.exit (S2SAFE().unpackage())